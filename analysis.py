@@ -0,0 +1,292 @@
+from ast import *
+
+
+def temp_name(slot):
+    """
+    Returns the name under which an optimizer temporary appears in def-use sets.
+
+    The '$' prefix cannot occur in identifiers, so it never clashes with a variable.
+
+    Args:
+        slot (int): The number of the temporary.
+
+    Returns:
+        str: The def-use name of the temporary.
+    """
+    return f"${slot}"
+
+
+def child_nodes(node):
+    """
+    Returns the direct children of a node in evaluation order.
+
+    Function bodies are not children of their FunctionDefNode: they run in their
+    own frame, so their assignments never rebind names of the enclosing code.
+
+    Args:
+        node (ASTNode or list): The node, or a list of statements.
+
+    Returns:
+        list: The child nodes.
+    """
+    if isinstance(node, list):
+        return node
+    if isinstance(node, BinOpNode):
+        return [node.left, node.right]
+    if isinstance(node, (VarAssignNode, TempAssignNode)):
+        return [node.value]
+    if isinstance(node, IndexAccessNode):
+        return [node.index]
+    if isinstance(node, IndexAssignNode):
+        return [node.index, node.value]
+    if isinstance(node, ArrayLiteralNode):
+        return node.elements
+    if isinstance(node, WhileNode):
+        return [node.condition] + node.preheader + node.body + (node.fast_body or [])
+    if isinstance(node, IfNode):
+        return [node.condition] + node.if_body + (node.else_body or [])
+    if isinstance(node, ForNode):
+        return [part for part in (node.init, node.condition) if part is not None] + node.body + \
+            ([node.step] if node.step is not None else [])
+    if isinstance(node, DoWhileNode):
+        return node.body + [node.condition]
+    if isinstance(node, CallNode):
+        return node.args
+    if isinstance(node, ReturnNode):
+        return [node.value] if node.value is not None else []
+    return []
+
+
+def walk(node):
+    """
+    Yields a node and all of its descendants.
+
+    Args:
+        node (ASTNode or list): The root node, or a list of statements.
+
+    Yields:
+        ASTNode: Each node of the subtree.
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, list):
+            yield current
+        stack.extend(reversed(child_nodes(current)))
+
+
+def assigned_names(node):
+    """
+    Collects the names rebound anywhere inside a subtree.
+
+    Writes into array elements do not rebind a name and are not included.
+
+    Args:
+        node (ASTNode or list): The subtree to inspect.
+
+    Returns:
+        set of str: Assigned variable names and def-use names of temporaries.
+    """
+    names = set()
+    for current in walk(node):
+        if isinstance(current, VarAssignNode):
+            names.add(current.name)
+        elif isinstance(current, TempAssignNode):
+            names.add(temp_name(current.slot))
+    return names
+
+
+def read_names(node):
+    """
+    Collects the names read anywhere inside a subtree, including array names.
+
+    Args:
+        node (ASTNode or list): The subtree to inspect.
+
+    Returns:
+        set of str: Read variable names and def-use names of temporaries.
+    """
+    names = set()
+    for current in walk(node):
+        if isinstance(current, VarAccessNode):
+            names.add(current.name)
+        elif isinstance(current, (IndexAccessNode, IndexAssignNode)):
+            names.add(current.array_name)
+        elif isinstance(current, TempAccessNode):
+            names.add(temp_name(current.slot))
+    return names
+
+
+def clone(node):
+    """
+    Returns a deep copy of a subtree.
+
+    Nodes are rebuilt through their constructors rather than with copy.deepcopy:
+    reading an instance's __dict__ turns its compact attribute storage into a
+    regular dictionary, which slows down every later access to the original nodes.
+
+    Args:
+        node (ASTNode or list): The subtree, or a list of statements.
+
+    Returns:
+        ASTNode or list: The copy.
+    """
+    if isinstance(node, list):
+        return [clone(item) for item in node]
+    if node is None:
+        return None
+    if isinstance(node, NumberNode):
+        copied = NumberNode(node.value)
+    elif isinstance(node, StringNode):
+        copied = StringNode(node.value)
+    elif isinstance(node, VarAccessNode):
+        copied = VarAccessNode(node.name)
+    elif isinstance(node, TempAccessNode):
+        copied = TempAccessNode(node.slot)
+    elif isinstance(node, BinOpNode):
+        copied = BinOpNode(clone(node.left), node.op, clone(node.right))
+    elif isinstance(node, VarAssignNode):
+        copied = VarAssignNode(node.name, clone(node.value))
+    elif isinstance(node, TempAssignNode):
+        copied = TempAssignNode(node.slot, clone(node.value))
+    elif isinstance(node, IndexAccessNode):
+        copied = type(node)(node.array_name, clone(node.index))
+    elif isinstance(node, IndexAssignNode):
+        copied = type(node)(node.array_name, clone(node.index), clone(node.value))
+    elif isinstance(node, ArrayLiteralNode):
+        copied = ArrayLiteralNode(clone(node.elements))
+    elif isinstance(node, WhileNode):
+        copied = WhileNode(clone(node.condition), clone(node.body), clone(node.preheader))
+        if node.fast_body is not None:
+            copied.fast_body = clone(node.fast_body)
+            copied.bounds_guard = node.bounds_guard
+    elif isinstance(node, IfNode):
+        copied = IfNode(clone(node.condition), clone(node.if_body),
+                        clone(node.else_body) if node.else_body else node.else_body)
+    elif isinstance(node, ForNode):
+        copied = ForNode(clone(node.init), clone(node.condition), clone(node.step), clone(node.body))
+    elif isinstance(node, DoWhileNode):
+        copied = DoWhileNode(clone(node.body), clone(node.condition))
+    elif isinstance(node, CallNode):
+        copied = CallNode(node.name, clone(node.args))
+    elif isinstance(node, ReturnNode):
+        copied = ReturnNode(clone(node.value))
+    elif isinstance(node, FunctionDefNode):
+        copied = FunctionDefNode(node.name, list(node.params), clone(node.body))
+    else:
+        return node
+    copied.line = node.line
+    copied.inferred_type = node.inferred_type
+    return copied
+
+
+def counted_range(node):
+    """
+    Recognizes a 'for' loop that is a simple integer range.
+
+    The loop must have the form `for (i = ...; i < n; i = i + c)` with '<', '<=',
+    '>' or '>=' (operands may be swapped), a non-zero integer literal step going
+    towards the bound and a bound that is an integer literal or a variable. Neither
+    `i` nor the bound variable may be assigned in the body. The interpreter still
+    checks on entry that the start and bound values are integers.
+
+    Args:
+        node (ForNode): The loop.
+
+    Returns:
+        tuple or None: (variable name, bound node, comparison operator, step), with the
+        operator normalized so that the variable is on the left, or None.
+    """
+    init, condition, step = node.init, node.condition, node.step
+    if not isinstance(init, VarAssignNode) or not isinstance(condition, BinOpNode):
+        return None
+    name = init.name
+    swapped = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+    if condition.op not in swapped:
+        return None
+    if isinstance(condition.left, VarAccessNode) and condition.left.name == name:
+        op, bound = condition.op, condition.right
+    elif isinstance(condition.right, VarAccessNode) and condition.right.name == name:
+        op, bound = swapped[condition.op], condition.left
+    else:
+        return None
+
+    if not (isinstance(step, VarAssignNode) and step.name == name and isinstance(step.value, BinOpNode)):
+        return None
+    value = step.value
+    if value.op == '+' and isinstance(value.left, NumberNode):
+        literal, variable = value.left, value.right
+    elif value.op in ('+', '-'):
+        literal, variable = value.right, value.left
+    else:
+        return None
+    if not (isinstance(variable, VarAccessNode) and variable.name == name
+            and isinstance(literal, NumberNode) and type(literal.value) is int):
+        return None
+    increment = literal.value if value.op == '+' else -literal.value
+    if increment == 0 or (increment > 0) != (op in ('<', '<=')):
+        return None
+
+    written = assigned_names(node.body)
+    if name in written:
+        return None
+    if isinstance(bound, VarAccessNode):
+        if bound.name == name or bound.name in written:
+            return None
+    elif not (isinstance(bound, NumberNode) and type(bound.value) is int):
+        return None
+    return name, bound, op, increment
+
+
+def is_locally_pure(function):
+    """
+    Checks that a function body has no side effects and reads nothing but its own locals.
+
+    Reads are allowed from parameters and from variables assigned by a top-level
+    statement that precedes the reading one; any other read could fall back to a
+    global variable. Writes into arrays and nested function definitions are side
+    effects. Calls are checked separately by `pure_functions`.
+
+    Args:
+        function (FunctionDefNode): The function to inspect.
+
+    Returns:
+        bool: True if the body alone is free of side effects and global reads.
+    """
+    defined = set(function.params)
+    for statement in function.body:
+        for node in walk(statement):
+            if isinstance(node, (IndexAssignNode, FunctionDefNode)):
+                return False
+            if isinstance(node, VarAccessNode) and node.name not in defined:
+                return False
+            if isinstance(node, IndexAccessNode) and node.array_name not in defined:
+                return False
+        if isinstance(statement, VarAssignNode):
+            defined.add(statement.name)
+    return True
+
+
+def pure_functions(functions):
+    """
+    Determines which functions are pure: their result depends only on their arguments.
+
+    A function is pure if its body is locally pure and it calls only pure functions.
+    Recursive calls are assumed pure until proven otherwise (greatest fixed point).
+
+    Args:
+        functions (dict): Maps function names to FunctionDefNode objects.
+
+    Returns:
+        set of str: The names of the pure functions.
+    """
+    pure = {name for name, function in functions.items() if is_locally_pure(function)}
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure):
+            calls = [node.name for node in walk(functions[name].body) if isinstance(node, CallNode)]
+            if any(callee not in pure for callee in calls):
+                pure.discard(name)
+                changed = True
+    return pure
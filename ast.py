@@ -4,8 +4,13 @@ class ASTNode:
     """
     Base class for all nodes in the Abstract Syntax Tree (AST).
     This class acts as a parent for more specific node types.
+
+    Attributes:
+        line (int or None): Source line of the statement, set by the parser for statement nodes.
+        inferred_type (str or None): Static type assigned by the type inference pass, if it has run.
     """
-    pass
+    line = None
+    inferred_type = None
 
 
 class BinOpNode(ASTNode):
@@ -50,6 +55,24 @@ class NumberNode(ASTNode):
         self.value = value
 
 
+class StringNode(ASTNode):
+    """
+    Node representing a string literal.
+
+    Attributes:
+        value (str): The interned string, without the surrounding quotes.
+    """
+
+    def __init__(self, value):
+        """
+        Initializes a string node.
+
+        Args:
+            value (str): The string to store in this node.
+        """
+        self.value = value
+
+
 class VarAssignNode(ASTNode):
     """
     Node representing a variable assignment operation.
@@ -96,18 +119,86 @@ class WhileNode(ASTNode):
     Attributes:
         condition (ASTNode): The condition that controls the loop execution.
         body (list of ASTNode): The list of statements to execute as long as the condition is true.
+        preheader (list of ASTNode): Statements executed once when the loop is entered.
+        fast_body (list of ASTNode or None): Copy of the body with unchecked array accesses,
+            used when `bounds_guard` holds on loop entry. Filled in by the optimizer.
+        bounds_guard (tuple or None): (index name, bound node, inclusive, array names) describing
+            the entry check that makes every unchecked access in `fast_body` safe.
+        condition_test (callable or None): The condition compiled by the interpreter on first use.
     """
 
-    def __init__(self, condition, body):
+    fast_body = None
+    bounds_guard = None
+    condition_test = None
+
+    def __init__(self, condition, body, preheader=None):
         """
         Initializes a while loop node.
 
         Args:
             condition (ASTNode): The loop condition to be evaluated before each iteration.
             body (list of ASTNode): The body of the loop to execute as long as the condition is true.
+            preheader (list of ASTNode, optional): Statements run once before the first iteration,
+                only if the loop is entered. Filled in by the optimizer with hoisted expressions.
         """
         self.condition = condition
         self.body = body
+        self.preheader = preheader or []
+
+
+class ForNode(ASTNode):
+    """
+    Node representing a counted 'for (init; condition; step)' loop.
+
+    Attributes:
+        init (ASTNode or None): Expression evaluated once before the loop.
+        condition (ASTNode): The condition checked before each iteration.
+        step (ASTNode or None): Expression evaluated after each iteration.
+        body (list of ASTNode): The statements executed on each iteration.
+        range_plan (tuple or None): Cached analysis of whether the loop is a simple integer
+            range; None until the interpreter first runs the loop, () if it is not.
+        condition_test (callable or None): The condition compiled by the interpreter on first use.
+    """
+    range_plan = None
+    condition_test = None
+
+    def __init__(self, init, condition, step, body):
+        """
+        Initializes a for loop node.
+
+        Args:
+            init (ASTNode or None): Expression evaluated once before the loop.
+            condition (ASTNode): The condition checked before each iteration.
+            step (ASTNode or None): Expression evaluated after each iteration.
+            body (list of ASTNode): The statements executed on each iteration.
+        """
+        self.init = init
+        self.condition = condition
+        self.step = step
+        self.body = body
+
+
+class DoWhileNode(ASTNode):
+    """
+    Node representing a 'do {...} while (condition)' loop, whose body runs at least once.
+
+    Attributes:
+        body (list of ASTNode): The statements executed on each iteration.
+        condition (ASTNode): The condition checked after each iteration.
+        condition_test (callable or None): The condition compiled by the interpreter on first use.
+    """
+    condition_test = None
+
+    def __init__(self, body, condition):
+        """
+        Initializes a do-while loop node.
+
+        Args:
+            body (list of ASTNode): The statements executed on each iteration.
+            condition (ASTNode): The condition checked after each iteration.
+        """
+        self.body = body
+        self.condition = condition
 
 
 class IfNode(ASTNode):
@@ -118,7 +209,9 @@ class IfNode(ASTNode):
         condition (ASTNode): The condition to evaluate to determine whether to execute the 'if' body.
         if_body (list of ASTNode): The list of statements to execute if the condition is true.
         else_body (list of ASTNode, optional): The list of statements to execute if the condition is false.
+        condition_test (callable or None): The condition compiled by the interpreter on first use.
     """
+    condition_test = None
 
     def __init__(self, condition, if_body, else_body=None):
         """
@@ -148,3 +241,123 @@ class IndexAssignNode(ASTNode):
         self.array_name = array_name
         self.index = index
         self.value = value
+
+
+class FunctionDefNode(ASTNode):
+    """
+    Node representing a function definition.
+
+    Attributes:
+        name (str): The name of the function.
+        params (list of str): The names of the parameters.
+        body (list of ASTNode): The statements executed on each call.
+    """
+
+    def __init__(self, name, params, body):
+        """
+        Initializes a function definition node.
+
+        Args:
+            name (str): The name of the function.
+            params (list of str): The names of the parameters.
+            body (list of ASTNode): The statements executed on each call.
+        """
+        self.name = name
+        self.params = params
+        self.body = body
+
+
+class CallNode(ASTNode):
+    """
+    Node representing a function call.
+
+    Attributes:
+        name (str): The name of the called function.
+        args (list of ASTNode): The argument expressions.
+    """
+
+    def __init__(self, name, args):
+        """
+        Initializes a function call node.
+
+        Args:
+            name (str): The name of the called function.
+            args (list of ASTNode): The argument expressions.
+        """
+        self.name = name
+        self.args = args
+
+
+class ReturnNode(ASTNode):
+    """
+    Node representing a 'return' statement inside a function body.
+
+    Attributes:
+        value (ASTNode or None): The returned expression, or None for a bare 'return'.
+    """
+
+    def __init__(self, value=None):
+        """
+        Initializes a return node.
+
+        Args:
+            value (ASTNode, optional): The returned expression.
+        """
+        self.value = value
+
+
+class UncheckedIndexAccessNode(IndexAccessNode):
+    """
+    Array element access proven safe by the optimizer: the variable holds a list and
+    the index is an integer within its bounds, so no runtime checks are performed.
+    """
+    pass
+
+
+class UncheckedIndexAssignNode(IndexAssignNode):
+    """
+    Array element assignment proven safe by the optimizer, performed without runtime checks.
+    """
+    pass
+
+
+class TempAssignNode(ASTNode):
+    """
+    Node storing the value of an expression in an optimizer temporary.
+
+    Temporaries live apart from program variables, so introducing them does not
+    change the variable state visible to the program.
+
+    Attributes:
+        slot (int): The number of the temporary.
+        value (ASTNode): The expression whose value is stored.
+    """
+
+    def __init__(self, slot, value):
+        """
+        Initializes a temporary assignment node.
+
+        Args:
+            slot (int): The number of the temporary.
+            value (ASTNode): The expression whose value is stored.
+        """
+        self.slot = slot
+        self.value = value
+
+
+class TempAccessNode(ASTNode):
+    """
+    Node reading the value of an optimizer temporary.
+
+    Attributes:
+        slot (int): The number of the temporary.
+    """
+
+    def __init__(self, slot):
+        """
+        Initializes a temporary access node.
+
+        Args:
+            slot (int): The number of the temporary.
+        """
+        self.slot = slot
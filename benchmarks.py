@@ -0,0 +1,434 @@
+# benchmarks.py
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+import interpreter
+from main import run
+from snapshot import Snapshot
+
+
+def measure(code, repeat=5, **options):
+    """
+    Runs a program several times and returns its result and the best wall-clock time.
+
+    Args:
+        code (str): The program source.
+        repeat (int): Number of runs.
+        **options: Keyword arguments passed to `main.run`.
+
+    Returns:
+        tuple: The program result and the best time in seconds.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(code, **options)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def compare(title, variants):
+    """
+    Measures several variants of a program and prints their times relative to the first one.
+
+    Args:
+        title (str): Name of the benchmark.
+        variants (list of tuple): (label, code, options) for each variant.
+    """
+    print(f"=== {title} ===")
+    baseline = None
+    for label, code, options in variants:
+        result, elapsed = measure(code, **options)
+        baseline = baseline or elapsed
+        print(f"{label:<30} {elapsed * 1000:9.1f} мс  x{baseline / elapsed:5.2f}  результат: {result}")
+    print()
+
+
+NESTED_LOOPS = """
+a = 3;
+b = 7;
+s = 0;
+i = 0;
+while (i < N) {
+    j = 0;
+    while (j < N) {
+        x = (a * b) + i;
+        y = (a * b) - j;
+        z = (x * (a + b)) + (x * (a + b));
+        s = s + x + y + z;
+        j = j + 1;
+    }
+    i = i + 1;
+}
+s;
+"""
+
+
+def bench_optimizer():
+    code = NESTED_LOOPS.replace("N", "150")
+    compare("Вынос инвариантов и общие подвыражения (вложенные циклы 150x150)", [
+        ("без оптимизации", code, {}),
+        ("optimize=True", code, {"optimize": True}),
+    ])
+
+
+ARRAY_LOOP = """
+a = [1] * N;
+b = [0] * N;
+c = [2] * N;
+s = 0;
+k = 0;
+while (k < 20) {
+    i = 0;
+    while (i < N) {
+        b[i] = a[i] * c[i] + a[i];
+        c[i] = b[i] - a[i];
+        s = s + b[i] + c[i];
+        i = i + 1;
+    }
+    k = k + 1;
+}
+s;
+"""
+
+
+def bench_bounds_checks():
+    size = 2000
+    code = ARRAY_LOOP.replace("N", str(size))
+    compare(f"Доступ к массиву по счётчику цикла (20 x {size})", [
+        ("без оптимизации", code, {}),
+        ("optimize=True", code, {"optimize": True}),
+    ])
+
+
+FIBONACCI = """
+function fib(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+r = fib(N);
+r;
+"""
+
+
+def bench_functions():
+    code = FIBONACCI.replace("N", "20")
+    compare("Рекурсивные вызовы функций (fib(20))", [
+        ("без мемоизации", code, {}),
+        ("memoize=True", code, {"memoize": True}),
+    ])
+
+
+COUNTED_WHILE = """
+s = 0;
+i = 0;
+while (i < N) {
+    j = 0;
+    while (j < 100) {
+        s = s + j;
+        j = j + 1;
+    }
+    i = i + 1;
+}
+s;
+"""
+
+COUNTED_FOR = """
+s = 0;
+for (i = 0; i < N; i = i + 1) {
+    for (j = 0; j < 100; j = j + 1) {
+        s = s + j;
+    }
+}
+s;
+"""
+
+COUNTED_DO_WHILE = """
+s = 0;
+i = 0;
+do {
+    j = 0;
+    do {
+        s = s + j;
+        j = j + 1;
+    } while (j < 100);
+    i = i + 1;
+} while (i < N);
+s;
+"""
+
+
+def bench_counted_loops():
+    compare("Счётные циклы (1000 x 100 итераций)", [
+        ("while", COUNTED_WHILE.replace("N", "1000"), {}),
+        ("do-while", COUNTED_DO_WHILE.replace("N", "1000"), {}),
+        ("for", COUNTED_FOR.replace("N", "1000"), {}),
+    ])
+
+
+# Runs a script file in a fresh process and prints its peak RSS in kilobytes
+MEMORY_PROBE = """
+import resource
+import sys
+from main import run, run_stream
+path, mode = sys.argv[1], sys.argv[2]
+with open(path) as source:
+    result = run(source.read()) if mode == "whole" else run_stream(source, optimize=mode == "optimized")
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, result)
+"""
+
+
+def peak_rss(path, mode):
+    """
+    Runs a script file in a separate interpreter process and measures its peak memory.
+
+    Args:
+        path (str): Path of the script file.
+        mode (str): "whole" for `main.run`, "stream" for `main.run_stream`, "optimized" for
+            `main.run_stream` with the optimizer.
+
+    Returns:
+        tuple: Peak resident set size in kilobytes and the program result as text.
+    """
+    output = subprocess.run([sys.executable, "-c", MEMORY_PROBE, path, mode], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+    return int(output[0]), output[1]
+
+
+# Generators of the i-th top-level statement of a streamed script
+STREAMED_STATEMENTS = {
+    "присваивания": lambda i: f"x{i % 100} = {i} * 2 + x{(i + 1) % 100};\n",
+    "if/while": lambda i: (f"if (x{i % 100} < {i}) {{ x{i % 100} = {i} + 1; }}\n" if i % 2 else
+                           f"j = 0; while (j < 2 && x{i % 100} > 0) {{ j = j + 1; }}\n"),
+    "подвыражения": lambda i: f"x{i % 100} = (x{(i + 1) % 100} + {i}) * 3 - (x{(i + 1) % 100} + {i}) * 2;\n",
+}
+
+
+def bench_streaming():
+    print("=== Пиковая память (RSS) в зависимости от размера сгенерированного скрипта ===")
+    for kind, statement in STREAMED_STATEMENTS.items():
+        for count in (10000, 50000, 200000):
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as script:
+                for i in range(count):
+                    script.write(statement(i))
+                path = script.name
+            try:
+                size = os.path.getsize(path) // 1024
+                whole, result = peak_rss(path, "whole")
+                streamed, streamed_result = peak_rss(path, "stream")
+                optimized, optimized_result = peak_rss(path, "optimized")
+                print(f"{kind:<12} {count:>7} операторов, {size:>6} КБ: run {whole:>8} КБ,"
+                      f" run_stream {streamed:>8} КБ, с optimize {optimized:>8} КБ"
+                      f"  результат: {result} / {streamed_result} / {optimized_result}")
+            finally:
+                os.unlink(path)
+    print()
+
+
+def bench_hooks():
+    code = COUNTED_WHILE.replace("N", "500")
+    counter = [0]
+
+    def count(*args):
+        counter[0] += 1
+
+    all_events = [(event, count) for event in ("statement", "loop_iteration", "variable_write", "array_write", "error")]
+    compare("Обработчики событий выполнения (500 x 100 итераций)", [
+        ("без обработчиков", code, {}),
+        ("statement, каждое 1000-е", code, {"hooks": [("statement", count, 1000)]}),
+        ("statement, каждое", code, {"hooks": [("statement", count)]}),
+        ("loop_iteration, каждое 1000-е", code, {"hooks": [("loop_iteration", count, 1000)]}),
+        ("array_write, каждое", code, {"hooks": [("array_write", count)]}),
+        ("все события, каждое", code, {"hooks": all_events}),
+    ])
+    # Only the node kinds an event needs are instrumented; sampling skips callbacks, not that dispatch
+    print("Выборка пропускает только вызовы обработчиков: накладные расходы на диспетчеризацию"
+          " наблюдаемых узлов остаются теми же.")
+    print()
+
+
+STRING_BUILDER = """
+s = "";
+i = 0;
+while (i < N) {
+    s = s + "0123456789";
+    i = i + 1;
+}
+c = s[N * 10 - 1];
+c;
+"""
+
+
+def bench_strings():
+    print("=== Сцепление строк в цикле: верёвки против копирования ===")
+    for count in (5000, 20000, 80000):
+        code = STRING_BUILDER.replace("N", str(count))
+        result, rope = measure(code, repeat=3)
+        threshold = interpreter.ROPE_THRESHOLD
+        interpreter.ROPE_THRESHOLD = float("inf")
+        try:
+            _, plain = measure(code, repeat=3)
+        finally:
+            interpreter.ROPE_THRESHOLD = threshold
+        print(f"{count * 10:>8} символов: копирование {plain * 1000:9.1f} мс, верёвка {rope * 1000:9.1f} мс"
+              f"  x{plain / rope:5.2f}  результат: {result}")
+    print()
+
+
+INDEPENDENT_LOOPS = """
+s1 = 0;
+i1 = 0;
+while (i1 < N) {
+    s1 = s1 + i1 * 3;
+    i1 = i1 + 1;
+}
+s2 = 0;
+for (i2 = 0; i2 < N; i2 = i2 + 1) {
+    s2 = s2 + i2 / 2;
+}
+s3 = 1.0;
+i3 = 0;
+while (i3 < N) {
+    s3 = s3 * 1.000001 + 1;
+    i3 = i3 + 1;
+}
+s4 = 0;
+i4 = 0;
+do {
+    s4 = s4 + i4 - 7;
+    i4 = i4 + 1;
+} while (i4 < N);
+r = s1 + s2 + s4;
+r;
+"""
+
+
+def bench_parallel():
+    code = INDEPENDENT_LOOPS.replace("N", "100000")
+    workers = os.cpu_count() or 1
+    compare(f"Четыре независимых цикла по 100000 итераций (ядер: {workers})", [
+        ("последовательно", code, {}),
+        ("parallel=True", code, {"parallel": True}),
+        ("parallel=4", code, {"parallel": 4}),
+    ])
+
+
+# Three statements build the lookup arrays, the last two use them
+LOOKUP_TABLES = """
+squares = [0] * N;
+roots = [0.0] * N;
+for (i = 0; i < N; i = i + 1) {
+    squares[i] = i * i;
+    roots[i] = i / 2.0;
+}
+r = squares[N - 1] + roots[N - 1];
+r;
+"""
+
+
+def bench_snapshots():
+    print("=== Снимок состояния после построения массивов против повторного выполнения ===")
+    for count in (10000, 100000, 300000):
+        code = LOOKUP_TABLES.replace("N", str(count))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.bin")
+            result, rerun = measure(code, repeat=1, snapshot=path, snapshot_every=3)
+            resumed, resume = measure(code, repeat=3, snapshot=path, resume=True)
+            start = time.perf_counter()
+            snapshot = Snapshot.load(path)
+            load = time.perf_counter() - start
+            pickled = pickle.dumps(snapshot.variables, pickle.HIGHEST_PROTOCOL)
+            start = time.perf_counter()
+            pickle.loads(pickled)
+            unpickle = time.perf_counter() - start
+            print(f"{count:>7} элементов: выполнение {rerun * 1000:8.1f} мс, возобновление {resume * 1000:6.1f} мс"
+                  f" (загрузка снимка {load * 1000:5.1f} мс, pickle {unpickle * 1000:5.1f} мс),"
+                  f" снимок {os.path.getsize(path) // 1024:>5} КБ, pickle {len(pickled) // 1024:>5} КБ"
+                  f"  результат: {result} / {resumed}")
+    print()
+
+
+CONDITION_LOOPS = """
+a = [0] * 200;
+i = 0;
+while (i < 200) {
+    a[i] = i - (i / 7) * 7;
+    i = i + 1;
+}
+hits = 0;
+k = 0;
+while (k < N) {
+    j = 0;
+    while (j < 200 && a[j] != 6) {
+        if (a[j] == 1 || a[j] == 3 && j > 10) {
+            hits = hits + 1;
+        }
+        j = j + 1;
+    }
+    k = k + 1;
+}
+hits;
+"""
+
+SHORT_CIRCUIT = """
+function cost(x) {
+    s = 0;
+    for (t = 0; t < 20; t = t + 1) {
+        s = s + x;
+    }
+    return s;
+}
+hits = 0;
+for (i = 0; i < 20000; i = i + 1) {
+    if (CONDITION) {
+        hits = hits + 1;
+    }
+}
+hits;
+"""
+
+
+def bench_conditions():
+    code = CONDITION_LOOPS.replace("N", "2000")
+    compile_condition = interpreter.compile_condition
+    interpreter.compile_condition = lambda node: lambda runner: runner.interpret_node(node)
+    try:
+        _, dispatched = measure(code)
+    finally:
+        interpreter.compile_condition = compile_condition
+    result, compiled = measure(code)
+    print("=== Составные условия в циклах (2000 x 6 итераций) ===")
+    print(f"{'через interpret_node':<30} {dispatched * 1000:9.1f} мс  x 1.00")
+    print(f"{'скомпилированные условия':<30} {compiled * 1000:9.1f} мс  x{dispatched / compiled:5.2f}  результат: {result}")
+    print()
+    compare("Сокращённое вычисление && (20000 проверок, дорогой правый операнд)", [
+        ("дорогой операнд первым", SHORT_CIRCUIT.replace("CONDITION", "cost(i) < 0 && i < 0"), {}),
+        ("дешёвый операнд первым", SHORT_CIRCUIT.replace("CONDITION", "i < 0 && cost(i) < 0"), {}),
+    ])
+
+
+BENCHMARKS = {
+    "optimizer": bench_optimizer,
+    "bounds_checks": bench_bounds_checks,
+    "functions": bench_functions,
+    "counted_loops": bench_counted_loops,
+    "streaming": bench_streaming,
+    "hooks": bench_hooks,
+    "strings": bench_strings,
+    "parallel": bench_parallel,
+    "snapshots": bench_snapshots,
+    "conditions": bench_conditions,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -1,4 +1,177 @@
+import operator
+import sys
+from collections import OrderedDict
+
 from ast import *
+from analysis import counted_range, pure_functions
+from strings import ROPE_THRESHOLD, Rope
+from type_inference import INT, FLOAT
+
+FRAME_POOL_SIZE = 256  # Maximum number of cleared call frames kept for reuse
+MAX_CALL_DEPTH = 1000  # Default limit of nested function calls
+
+# Python frames reserved per function call of the language: the call itself takes about
+# five, and every statement or operator nested in the body takes one more
+PYTHON_FRAMES_PER_CALL = 40
+
+# Comparison operators of conditions compiled by `compile_condition`
+COMPARISON_FUNCTIONS = {
+    '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge, '==': operator.eq, '!=': operator.ne,
+}
+
+
+def compile_condition(node):
+    """
+    Compiles a condition into nested closures that decide a branch directly.
+
+    Comparisons call the operator on their operands without going through the
+    dispatch of `interpret_node`, and '&&'/'||' become Python's short-circuit
+    `and`/`or`, so no intermediate operand values are returned from `interpret_node`
+    just to be tested. Literals and variables are read in place; any other operand
+    is evaluated by `interpret_node`. The closures take the interpreter as their
+    argument, so a compiled test does not keep an interpreter alive.
+
+    Args:
+        node (ASTNode): The condition.
+
+    Returns:
+        callable: Function of the interpreter returning a value with the condition's truth value.
+    """
+    if isinstance(node, BinOpNode) and node.op in ('&&', '||'):
+        left, right = compile_condition(node.left), compile_condition(node.right)
+        if node.op == '&&':
+            return lambda interpreter: left(interpreter) and right(interpreter)
+        return lambda interpreter: left(interpreter) or right(interpreter)
+    if isinstance(node, BinOpNode) and node.op in COMPARISON_FUNCTIONS:
+        compare = COMPARISON_FUNCTIONS[node.op]
+        if isinstance(node.right, NumberNode):
+            value, left = node.right.value, compile_operand(node.left)
+            return lambda interpreter: compare(left(interpreter), value)
+        left, right = compile_operand(node.left), compile_operand(node.right)
+        return lambda interpreter: compare(left(interpreter), right(interpreter))
+    return compile_operand(node)
+
+
+def compile_operand(node):
+    """
+    Compiles an operand of a condition into a closure returning its value.
+
+    Args:
+        node (ASTNode): The operand.
+
+    Returns:
+        callable: Function of the interpreter returning the operand's value.
+    """
+    if isinstance(node, NumberNode):
+        value = node.value
+        return lambda interpreter: value
+    if isinstance(node, VarAccessNode):
+        name = node.name
+
+        def read(interpreter):
+            # Same lookup as for VarAccessNode: the current frame, then the globals
+            variables = interpreter.variables
+            return variables[name] if name in variables else interpreter.globals.get(name, 0)
+        return read
+    return lambda interpreter: interpreter.interpret_node(node)
+
+# Offset from the bound of a counted loop to the stop value of the equivalent range()
+RANGE_STOP_OFFSET = {'<': 0, '<=': 1, '>': 0, '>=': -1}
+
+
+class ReturnSignal(Exception):
+    """
+    Raised by a 'return' statement to unwind to the enclosing function call.
+
+    Attributes:
+        value: The returned value.
+    """
+
+    def __init__(self, value):
+        """
+        Initializes the signal with the returned value.
+
+        Args:
+            value: The returned value.
+        """
+        self.value = value
+
+
+# Events reported to execution hooks, with the arguments passed to their callbacks
+HOOK_EVENTS = {
+    "statement": "(node)",
+    "loop_iteration": "(loop node, iteration number starting at 1)",
+    "variable_write": "(name, value)",
+    "array_write": "(array name, index, value)",
+    "error": "(statement node, exception)",
+}
+
+# Node types that must take the instrumented path for each event; statements (nodes with a
+# source line) also take it while 'statement' or 'error' hooks are registered
+HOOK_NODE_TYPES = {
+    "statement": (),
+    "loop_iteration": (WhileNode, ForNode, DoWhileNode),
+    # Counted 'for' loops write their induction variable without a VarAssignNode
+    "variable_write": (VarAssignNode, ForNode),
+    "array_write": (IndexAssignNode, UncheckedIndexAssignNode),
+    "error": (),
+}
+
+
+class Hook:
+    """
+    Callback registered for an execution event, optionally sampled.
+
+    Attributes:
+        callback (callable): Function called with the event arguments.
+        every (int): The callback is called for every Nth event only.
+        count (int): Events seen since the last call.
+    """
+
+    def __init__(self, callback, every=1):
+        """
+        Initializes a hook.
+
+        Args:
+            callback (callable): Function called with the event arguments.
+            every (int, optional): Call the callback for every Nth event only.
+        """
+        self.callback = callback
+        self.every = every
+        self.count = 0
+
+
+class MemoCache:
+    """
+    Bounded LRU cache of function results with hit statistics.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results.
+        entries (OrderedDict): Argument keys mapped to results, least recently used first.
+        hits (int): Number of calls answered from the cache.
+        misses (int): Number of calls that had to be executed.
+    """
+
+    def __init__(self, maxsize):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of cached results.
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+            dict: Hits, misses, current size and maximum size.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
 
 
 class Interpreter:
@@ -6,14 +179,48 @@ class Interpreter:
     Interpreter for executing an Abstract Syntax Tree (AST).
 
     Attributes:
-        variables (dict): Stores variable names and their values for the program's environment.
+        variables (dict): Stores variable names and their values for the current frame;
+            at the top level this is the global environment.
+        globals (dict): The global environment, consulted by functions for names they do not define.
+        temporaries (dict): Stores values of optimizer temporaries, kept apart from program variables.
+        functions (dict): Maps function names to their FunctionDefNode.
+        frame_pool (list): Cleared call frames ready to be reused by the next call.
+        memoize (bool): Whether results of pure functions with numeric arguments are cached.
+        memo_size (int): Maximum number of cached results per function.
+        memo_caches (dict): Maps names of pure functions to their MemoCache.
+        hooks (dict): Maps event names to lists of registered Hook objects.
+        instrumented_nodes (frozenset): Node types the registered hooks need to observe, see HOOK_NODE_TYPES.
+        instruments_statements (bool): Whether every statement is observed, for 'statement' or 'error' hooks.
+        max_call_depth (int): Maximum number of nested function calls.
+        call_depth (int): Number of function calls currently in progress.
     """
 
-    def __init__(self):
+    def __init__(self, memoize=False, memo_size=1024, max_call_depth=MAX_CALL_DEPTH):
         """
         Initializes the interpreter with an empty environment for variables.
+
+        The Python recursion limit is raised, if needed, so that `max_call_depth`
+        nested calls fit; deeper recursion is reported as a language error.
+
+        Args:
+            memoize (bool, optional): Cache results of pure functions called with numeric arguments.
+            memo_size (int, optional): Maximum number of cached results per function.
+            max_call_depth (int, optional): Maximum number of nested function calls.
         """
         self.variables = {}  # Dictionary to store variable values
+        self.globals = self.variables
+        self.temporaries = {}  # Values of temporaries introduced by the optimizer
+        self.functions = {}
+        self.frame_pool = []
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.memo_caches = {}
+        self.hooks = {event: [] for event in HOOK_EVENTS}
+        self.instrumented_nodes = frozenset()
+        self.instruments_statements = False
+        self.max_call_depth = max_call_depth
+        self.call_depth = 0
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), max_call_depth * PYTHON_FRAMES_PER_CALL))
 
     def interpret(self, nodes):
         """
@@ -28,7 +235,7 @@ class Interpreter:
         result = None  # To store the result of the last evaluated node
         for node in nodes:
             result = self.interpret_node(node)
-        return result
+        return str(result) if type(result) is Rope else result
 
     def interpret_node(self, node):
         """
@@ -47,21 +254,39 @@ class Interpreter:
         if isinstance(node, NumberNode):
             return node.value
 
+        # Handle string literals
+        elif isinstance(node, StringNode):
+            return node.value
+
         # Handle binary operations (e.g., +, -, *, /)
         elif isinstance(node, BinOpNode):
             left_val = self.interpret_node(node.left)
+            # Logical operators evaluate the right operand only if the left one does not decide the result
+            if node.op == '&&':
+                return self.interpret_node(node.right) if left_val else left_val
+            if node.op == '||':
+                return left_val if left_val else self.interpret_node(node.right)
             right_val = self.interpret_node(node.right)
 
             # Perform the operation based on the operator in the node
             if node.op == '+':
-                return left_val + right_val
+                result = left_val + right_val
+                # Long strings become ropes, so repeated concatenation does not copy them
+                if type(result) is str and len(result) >= ROPE_THRESHOLD:
+                    return Rope(result)
+                return result
             elif node.op == '-':
                 return left_val - right_val
             elif node.op == '*':
                 return left_val * right_val
             elif node.op == '/':
+                # Operand types proven by the type inference pass skip the runtime check
+                if node.inferred_type == INT:
+                    return left_val // right_val
+                elif node.inferred_type == FLOAT:
+                    return left_val / right_val
                 # Perform integer division if both operands are integers
-                if isinstance(left_val, int) and isinstance(right_val, int):
+                elif isinstance(left_val, int) and isinstance(right_val, int):
                     return left_val // right_val
                 else:
                     return left_val / right_val
@@ -77,10 +302,6 @@ class Interpreter:
                 return left_val == right_val
             elif node.op == '!=':
                 return left_val != right_val
-            elif node.op == '&&':
-                return left_val and right_val
-            elif node.op == '||':
-                return left_val or right_val
             else:
                 raise ValueError(f"Unknown operator {node.op}")
 
@@ -92,21 +313,89 @@ class Interpreter:
 
         # Handle variable access
         elif isinstance(node, VarAccessNode):
-            # Retrieve the variable value or return 0 if the variable is not defined
-            return self.variables.get(node.name, 0)
+            # Look in the current frame, then in the globals; undefined variables are 0
+            variables = self.variables
+            if node.name in variables:
+                return variables[node.name]
+            return self.globals.get(node.name, 0)
+
+        # Optimizer temporaries replace variable reads in hot loops, so they are dispatched
+        # right after them
+        elif isinstance(node, TempAccessNode):
+            return self.temporaries[node.slot]
+
+        elif isinstance(node, TempAssignNode):
+            value = self.interpret_node(node.value)
+            self.temporaries[node.slot] = value
+            return value
+
+        # Array accesses proven safe by the optimizer skip all checks; they sit in hot loop
+        # bodies, so they are dispatched before the compound statements
+        elif isinstance(node, UncheckedIndexAccessNode):
+            return self.variables[node.array_name][self.interpret_node(node.index)]
+
+        elif isinstance(node, UncheckedIndexAssignNode):
+            index = self.interpret_node(node.index)
+            value = self.interpret_node(node.value)
+            self.variables[node.array_name][index] = value
+            return value
 
         # Handle 'while' loop
         elif isinstance(node, WhileNode):
             result = None
+            body = node.body
+            if node.fast_body is not None and self.bounds_guard_holds(node.bounds_guard):
+                # Every array access by the induction variable is proven in range for this run
+                body = node.fast_body
+            test = node.condition_test or self.condition_test(node)
+            condition = test(self)
+            if condition and node.preheader:
+                # Invariant expressions hoisted by the optimizer run once, only if the loop is entered
+                for stmt in node.preheader:
+                    self.interpret_node(stmt)
             # Loop while the condition evaluates to True
-            while self.interpret_node(node.condition):
+            while condition:
+                for stmt in body:
+                    result = self.interpret_node(stmt)
+                condition = test(self)
+            return result
+
+        # Handle counted 'for' loop
+        elif isinstance(node, ForNode):
+            if node.init is not None:
+                self.interpret_node(node.init)
+            plan = node.range_plan
+            if plan is None:
+                plan = node.range_plan = counted_range(node) or ()
+            if plan:
+                name, bound, op, step = plan
+                start = self.variables[name]
+                limit = self.interpret_node(bound)
+                if type(start) is int and type(limit) is int:
+                    return self.run_range(node.body, name, range(start, limit + RANGE_STOP_OFFSET[op], step))
+            result = None
+            test = node.condition_test or self.condition_test(node)
+            while test(self):
                 for stmt in node.body:
                     result = self.interpret_node(stmt)
+                if node.step is not None:
+                    self.interpret_node(node.step)
             return result
 
+        # Handle 'do-while' loop, whose body runs before the first check
+        elif isinstance(node, DoWhileNode):
+            result = None
+            test = node.condition_test or self.condition_test(node)
+            while True:
+                for stmt in node.body:
+                    result = self.interpret_node(stmt)
+                if not test(self):
+                    return result
+
         # Handle 'if' statement with optional 'else' clause
         elif isinstance(node, IfNode):
-            if self.interpret_node(node.condition):
+            test = node.condition_test or self.condition_test(node)
+            if test(self):
                 # Execute the 'if' body if the condition is true
                 for stmt in node.if_body:
                     self.interpret_node(stmt)
@@ -120,11 +409,21 @@ class Interpreter:
 
         elif isinstance(node, IndexAccessNode):
             array = self.variables.get(node.array_name)
+            if array is None:
+                array = self.globals.get(node.array_name)
             if array is None:
                 raise ValueError(f"Переменная '{node.array_name}' не определена")
             index = self.interpret_node(node.index)
             if not isinstance(array, list):
-                raise ValueError(f"Переменная '{node.array_name}' не является массивом")
+                if not isinstance(array, (str, Rope)):
+                    raise ValueError(f"Переменная '{node.array_name}' не является массивом")
+                # Indexing a string yields a one-character string
+                if not isinstance(index, int):
+                    raise ValueError("Индекс строки должен быть целым числом")
+                try:
+                    return str(array)[index]
+                except IndexError:
+                    raise ValueError(f"Индекс {index} выходит за пределы строки '{node.array_name}'")
             if not isinstance(index, int):
                 raise ValueError("Индекс массива должен быть целым числом")
             try:
@@ -134,6 +433,8 @@ class Interpreter:
 
         elif isinstance(node, IndexAssignNode):
             array = self.variables.get(node.array_name)
+            if array is None:
+                array = self.globals.get(node.array_name)
             if array is None:
                 raise ValueError(f"Переменная '{node.array_name}' не определена")
             index = self.interpret_node(node.index)
@@ -147,6 +448,357 @@ class Interpreter:
             except IndexError:
                 raise ValueError(f"Индекс {index} выходит за пределы массива '{node.array_name}'")
             return value
+
+        # Handle function definitions, calls and returns
+        elif isinstance(node, FunctionDefNode):
+            self.functions[node.name] = node
+            if self.memoize:
+                # A new definition may change which functions are pure, so start over
+                self.memo_caches = {name: MemoCache(self.memo_size) for name in pure_functions(self.functions)}
+            return None
+
+        elif isinstance(node, CallNode):
+            return self.call_function(node.name, [self.interpret_node(arg) for arg in node.args])
+
+        elif isinstance(node, ReturnNode):
+            raise ReturnSignal(None if node.value is None else self.interpret_node(node.value))
+
         # Error handling for unexpected node types
         else:
             raise ValueError(f"Unknown node type: {type(node)}")
+
+    def condition_test(self, node):
+        """
+        Returns the compiled test of a loop's or 'if' statement's condition, compiling it on first use.
+
+        The test is cached on the statement node, like `ForNode.range_plan`, so it
+        is released together with the node.
+
+        Args:
+            node (WhileNode, ForNode, DoWhileNode or IfNode): The statement.
+
+        Returns:
+            callable: The test, see `compile_condition`.
+        """
+        test = node.condition_test = compile_condition(node.condition)
+        return test
+
+    def bounds_guard_holds(self, guard):
+        """
+        Checks on loop entry that the unchecked array accesses of a loop cannot fail.
+
+        Args:
+            guard (tuple): (index name, bound node, inclusive, array names) from the optimizer.
+
+        Returns:
+            bool: True if the index and bound are integers and every array is a list
+            containing all indices from the current index up to the bound.
+        """
+        name, bound, inclusive, array_names = guard
+        index = self.variables[name] if name in self.variables else self.globals.get(name, 0)
+        limit = self.interpret_node(bound)
+        if type(index) is not int or type(limit) is not int:
+            return False
+        if inclusive:
+            limit += 1
+        for array_name in array_names:
+            # Unchecked accesses read the current frame only, so arrays of other frames do not qualify
+            array = self.variables.get(array_name)
+            if not isinstance(array, list) or index < -len(array) or limit > len(array):
+                return False
+        return True
+
+    def run_range(self, body, name, values):
+        """
+        Runs a counted loop body over a native range, writing the induction variable directly.
+
+        Args:
+            body (list of ASTNode): The loop body.
+            name (str): The induction variable.
+            values (range): The values the variable takes on each iteration.
+
+        Returns:
+            result: The result of the last executed statement, or None if the loop did not run.
+        """
+        result = None
+        variables = self.variables
+        for value in values:
+            variables[name] = value
+            for stmt in body:
+                result = self.interpret_node(stmt)
+        # Leave the variable at the first value that fails the condition, as the step would
+        variables[name] = values[-1] + values.step if values else values.start
+        return result
+
+    def call_function(self, name, args):
+        """
+        Calls a function, answering from its memo cache when possible.
+
+        Args:
+            name (str): The name of the function.
+            args (list): The evaluated arguments.
+
+        Returns:
+            The value returned by the function, or None if it returns nothing.
+
+        Raises:
+            ValueError: If the function is not defined, the number of arguments is wrong
+                or the maximum call depth is exceeded.
+        """
+        function = self.functions.get(name)
+        if function is None:
+            raise ValueError(f"Функция '{name}' не определена")
+        if len(args) != len(function.params):
+            raise ValueError(f"Функция '{name}' ожидает {len(function.params)} аргументов, получено {len(args)}")
+
+        cache = self.memo_caches.get(name)
+        if cache is None or not all(type(arg) is int or type(arg) is float for arg in args):
+            return self.execute_function(function, args)
+
+        # 1 and 1.0 are equal but may lead to different results, so floats are keyed with their type
+        key = tuple(args) if all(type(arg) is int for arg in args) else tuple((type(arg), arg) for arg in args)
+        entries = cache.entries
+        if key in entries:
+            cache.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        cache.misses += 1
+        result = self.execute_function(function, args)
+        # Arrays are mutable, so only plain values may be shared between calls
+        if type(result) in (int, float, bool):
+            entries[key] = result
+            if len(entries) > cache.maxsize:
+                entries.popitem(last=False)
+        return result
+
+    def execute_function(self, function, args):
+        """
+        Executes a function body in a new frame taken from the frame pool.
+
+        Args:
+            function (FunctionDefNode): The function to execute.
+            args (list): The evaluated arguments.
+
+        Returns:
+            The value returned by the function, or None if it returns nothing.
+
+        Raises:
+            ValueError: If the call would exceed the maximum call depth.
+        """
+        if self.call_depth >= self.max_call_depth:
+            raise ValueError(f"Превышена максимальная глубина вызовов ({self.max_call_depth}) "
+                             f"в функции '{function.name}'")
+        frame = self.frame_pool.pop() if self.frame_pool else {}
+        frame.update(zip(function.params, args))
+        caller = self.variables
+        self.variables = frame
+        self.call_depth += 1
+        try:
+            for stmt in function.body:
+                self.interpret_node(stmt)
+            return None
+        except ReturnSignal as signal:
+            return signal.value
+        except RecursionError:
+            # Unusually deep nesting inside the bodies used up the reserved Python frames first
+            raise ValueError(f"Превышена максимальная глубина вызовов ({self.call_depth}) "
+                             f"в функции '{function.name}'") from None
+        finally:
+            self.call_depth -= 1
+            self.variables = caller
+            frame.clear()
+            if len(self.frame_pool) < FRAME_POOL_SIZE:
+                self.frame_pool.append(frame)
+
+    def memo_stats(self):
+        """
+        Returns memoization statistics for every memoized function.
+
+        Returns:
+            dict: Maps function names to their cache statistics.
+        """
+        return {name: cache.stats() for name, cache in self.memo_caches.items()}
+
+    def register_hook(self, event, callback, every=1):
+        """
+        Registers a callback for an execution event.
+
+        While any hook is registered, nodes are dispatched through
+        `interpret_node_instrumented`; without hooks the plain `interpret_node`
+        runs and pays nothing for the hook support. Only statements and the node
+        types the registered events need are instrumented, so a hook on one event
+        does not slow down the nodes that cannot trigger it. Sampling with `every`
+        only skips callbacks: the instrumented nodes pay their dispatch cost either way.
+
+        Args:
+            event (str): One of the names in HOOK_EVENTS.
+            callback (callable): Function called with the event arguments.
+            every (int, optional): Call the callback for every Nth event only.
+
+        Raises:
+            ValueError: If the event is unknown or `every` is not a positive integer.
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Неизвестное событие '{event}'")
+        if not isinstance(every, int) or every < 1:
+            raise ValueError("Частота выборки должна быть положительным целым числом")
+        self.hooks[event].append(Hook(callback, every))
+        self.update_instrumentation()
+        self.interpret_node = self.interpret_node_instrumented
+
+    def unregister_hook(self, event, callback):
+        """
+        Removes the hooks registered for an event with the given callback.
+
+        When no hooks remain, the plain dispatch path is restored.
+
+        Args:
+            event (str): One of the names in HOOK_EVENTS.
+            callback (callable): The callback passed to `register_hook`.
+        """
+        self.hooks[event] = [hook for hook in self.hooks[event] if hook.callback is not callback]
+        self.update_instrumentation()
+        if not any(self.hooks.values()) and "interpret_node" in self.__dict__:
+            del self.interpret_node
+
+    def update_instrumentation(self):
+        """
+        Recomputes which nodes the registered hooks need to observe.
+        """
+        self.instrumented_nodes = frozenset(node_type for event, hooks in self.hooks.items() if hooks
+                                            for node_type in HOOK_NODE_TYPES[event])
+        self.instruments_statements = bool(self.hooks["statement"] or self.hooks["error"])
+
+    def emit(self, event, *args):
+        """
+        Reports an event to its hooks, honoring their sampling rate.
+
+        Args:
+            event (str): The event name.
+            *args: The event arguments.
+        """
+        for hook in self.hooks[event]:
+            hook.count += 1
+            if hook.count >= hook.every:
+                hook.count = 0
+                hook.callback(*args)
+
+    def interpret_node_instrumented(self, node):
+        """
+        Interprets a node like `interpret_node`, reporting events to the registered hooks.
+
+        Statements (nodes carrying a source line) are reported here while
+        `instruments_statements` is set, and the node types in `instrumented_nodes`
+        report their writes and loop iterations; every other node is delegated to
+        `interpret_node` of the class, whose recursive calls come back through this
+        method. Instrumented loops run their generic form, without the counted-range
+        fast path and compiled conditions.
+
+        Args:
+            node (ASTNode): The AST node to interpret.
+
+        Returns:
+            result: The result of interpreting the node.
+        """
+        node_type = type(node)
+        if node.line is None or not self.instruments_statements:
+            # Nodes no registered event needs skip the instrumented path; leaves are
+            # evaluated here, without the extra call
+            if node_type is NumberNode:
+                return node.value
+            elif node_type is VarAccessNode:
+                if node.name in self.variables:
+                    return self.variables[node.name]
+                return self.globals.get(node.name, 0)
+            elif node_type not in self.instrumented_nodes:
+                return Interpreter.interpret_node(self, node)
+        if node.line is not None:
+            self.emit("statement", node)
+        try:
+            if node_type not in self.instrumented_nodes:
+                # Statements no registered event looks into, such as loops without 'loop_iteration'
+                # hooks, keep the fast paths of the class
+                return Interpreter.interpret_node(self, node)
+
+            if node_type is VarAssignNode:
+                value = self.interpret_node(node.value)
+                self.variables[node.name] = value
+                self.emit("variable_write", node.name, value)
+                return value
+
+            elif node_type is IndexAssignNode:
+                array = self.variables.get(node.array_name)
+                if array is None:
+                    array = self.globals.get(node.array_name)
+                if array is None:
+                    raise ValueError(f"Переменная '{node.array_name}' не определена")
+                index = self.interpret_node(node.index)
+                value = self.interpret_node(node.value)
+                if not isinstance(array, list):
+                    raise ValueError(f"Переменная '{node.array_name}' не является массивом")
+                if not isinstance(index, int):
+                    raise ValueError("Индекс массива должен быть целым числом")
+                try:
+                    array[index] = value
+                except IndexError:
+                    raise ValueError(f"Индекс {index} выходит за пределы массива '{node.array_name}'")
+                self.emit("array_write", node.array_name, index, value)
+                return value
+
+            elif node_type is UncheckedIndexAssignNode:
+                index = self.interpret_node(node.index)
+                value = self.interpret_node(node.value)
+                self.variables[node.array_name][index] = value
+                self.emit("array_write", node.array_name, index, value)
+                return value
+
+            elif node_type is WhileNode:
+                result = None
+                body = node.body
+                if node.fast_body is not None and self.bounds_guard_holds(node.bounds_guard):
+                    body = node.fast_body
+                condition = self.interpret_node(node.condition)
+                if condition and node.preheader:
+                    for stmt in node.preheader:
+                        self.interpret_node(stmt)
+                iteration = 0
+                while condition:
+                    iteration += 1
+                    self.emit("loop_iteration", node, iteration)
+                    for stmt in body:
+                        result = self.interpret_node(stmt)
+                    condition = self.interpret_node(node.condition)
+                return result
+
+            elif node_type is ForNode:
+                if node.init is not None:
+                    self.interpret_node(node.init)
+                result = None
+                iteration = 0
+                while self.interpret_node(node.condition):
+                    iteration += 1
+                    self.emit("loop_iteration", node, iteration)
+                    for stmt in node.body:
+                        result = self.interpret_node(stmt)
+                    if node.step is not None:
+                        self.interpret_node(node.step)
+                return result
+
+            elif node_type is DoWhileNode:
+                result = None
+                iteration = 0
+                while True:
+                    iteration += 1
+                    self.emit("loop_iteration", node, iteration)
+                    for stmt in node.body:
+                        result = self.interpret_node(stmt)
+                    if not self.interpret_node(node.condition):
+                        return result
+        except ReturnSignal:
+            raise
+        except Exception as error:
+            # Report the error once, at the innermost statement that raised it
+            if node.line is not None and not getattr(error, "hook_reported", False):
+                error.hook_reported = True
+                self.emit("error", node, error)
+            raise
@@ -19,7 +19,7 @@ class TokenType(Enum):
 
 
 # Set of keywords for the language
-KEYWORDS = {"if", "else", "while", "for", "do", "true", "false", "function"}
+KEYWORDS = {"if", "else", "while", "for", "do", "true", "false", "function", "return"}
 
 # Specification for matching each token type with a regular expression
 TOKEN_SPECIFICATION = [
@@ -39,6 +39,9 @@ TOKEN_SPECIFICATION = [
     ("MISMATCH", r'.'),  # Any character that does not match any token (invalid token)
 ]
 
+# Combined pattern matching any token, compiled once for all lexers
+TOKEN_REGEX = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_SPECIFICATION))
+
 
 class Lexer:
     """
@@ -55,7 +58,8 @@ class Lexer:
         Initializes the lexer with the source code text.
 
         Args:
-            text (str): The source code text to be tokenized.
+            text (str or iterable of str): The source code text to be tokenized, or an
+                iterable of source lines (e.g. an open file) to tokenize lazily.
         """
         self.text = text
         self.line = 1  # Start at the first line
@@ -75,38 +79,51 @@ class Lexer:
         Raises:
             SyntaxError: If an invalid character or sequence (mismatch) is encountered.
         """
-        tokens = []  # List to store the identified tokens
-
-        # Iterates through each match for the token patterns in TOKEN_SPECIFICATION
-        for mo in re.finditer('|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_SPECIFICATION), self.text):
-            kind = mo.lastgroup  # Type of the matched token (e.g., INTEGER, IDENTIFIER)
-            value = mo.group(kind)  # Actual value of the matched text
-            start_column = self.column  # Starting column for this token
-
-            if kind == "NEWLINE":
-                # Handle newline by incrementing line number and resetting column
-                self.line += 1
-                self.column = 0
-                continue
-            elif kind == "SKIP" or kind == "COMMENT":
-                # Ignore whitespace and comments (just update column position)
-                self.column += len(value)
-                continue
-            elif kind == "MISMATCH":
-                # Raise error for unmatched characters (invalid tokens)
-                raise SyntaxError(f"Недопустимый символ '{value}' в строке {self.line}, колонка {self.column}")
-            elif kind == "IDENTIFIER" and value in KEYWORDS:
-                # Recognize keywords as separate from identifiers
-                kind = "KEYWORD"
-            elif kind == "BOOLEAN":
-                # Convert boolean strings 'true'/'false' to Python booleans
-                value = value == "true"
-
-            # Create the token as a tuple with type, value, line, and start column
-            token = (TokenType[kind], value, self.line, start_column)
-            tokens.append(token)  # Add the token to the list
-            self.column += len(value)  # Update column for next token
-
-        # Append end-of-file token at the end of the input
-        tokens.append((TokenType.EOF, None, self.line, self.column))
-        return tokens
+        return list(self.iter_tokens())
+
+    def iter_tokens(self):
+        """
+        Yields tokens one at a time, in the same format as `tokenize`, ending with an EOF token.
+
+        No token spans a line break, so when the lexer was given an iterable of lines
+        each line is matched on its own and only the current line is held in memory.
+
+        Yields:
+            tuple: The next token.
+
+        Raises:
+            SyntaxError: If an invalid character or sequence (mismatch) is encountered.
+        """
+        chunks = [self.text] if isinstance(self.text, str) else self.text
+        for chunk in chunks:
+            # Iterates through each match for the token patterns in TOKEN_SPECIFICATION
+            for mo in TOKEN_REGEX.finditer(chunk):
+                kind = mo.lastgroup  # Type of the matched token (e.g., INTEGER, IDENTIFIER)
+                value = mo.group(kind)  # Actual value of the matched text
+                start_column = self.column  # Starting column for this token
+
+                if kind == "NEWLINE":
+                    # Handle newline by incrementing line number and resetting column
+                    self.line += 1
+                    self.column = 0
+                    continue
+                elif kind == "SKIP" or kind == "COMMENT":
+                    # Ignore whitespace and comments (just update column position)
+                    self.column += len(value)
+                    continue
+                elif kind == "MISMATCH":
+                    # Raise error for unmatched characters (invalid tokens)
+                    raise SyntaxError(f"Недопустимый символ '{value}' в строке {self.line}, колонка {self.column}")
+                elif kind == "IDENTIFIER" and value in KEYWORDS:
+                    # Recognize keywords as separate from identifiers
+                    kind = "KEYWORD"
+                elif kind == "BOOLEAN":
+                    # Convert boolean strings 'true'/'false' to Python booleans
+                    value = value == "true"
+
+                # Yield the token as a tuple with type, value, line, and start column
+                yield (TokenType[kind], value, self.line, start_column)
+                self.column += len(mo.group())  # Update column for next token
+
+        # End-of-file token at the end of the input
+        yield (TokenType.EOF, None, self.line, self.column)
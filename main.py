@@ -1,8 +1,15 @@
 from lexer import Lexer
-from parser import Parser
+from parser import Parser, StreamingParser
 from interpreter import Interpreter
+from type_inference import TypeInferencer
+from optimizer import Optimizer
+from parallel import ParallelExecutor
+from snapshot import SnapshotRunner, source_digest
 
-def run(source_code, debug=False):
+def run(source_code, debug=False, optimize=False, memoize=False, hooks=(), parallel=False,
+        snapshot=None, snapshot_every=0, resume=False):
+    if snapshot and parallel:
+        raise ValueError("Снимки состояния нельзя сочетать с параллельным выполнением")
     lexer = Lexer(source_code)
     tokens = lexer.tokenize()
     if debug:
@@ -15,10 +22,58 @@ def run(source_code, debug=False):
         print("\nAST:")
         for node in ast:
             print(node)
-    interpreter = Interpreter()
-    result = interpreter.interpret(ast)
+    inferencer = TypeInferencer(record=debug)
+    inferencer.infer(ast)
+    if debug:
+        print("\nТипы:")
+        for line in inferencer.dump():
+            print(line)
+    if optimize:
+        Optimizer().optimize(ast)
+    interpreter = Interpreter(memoize=memoize)
+    for hook in hooks:
+        interpreter.register_hook(*hook)  # (event, callback) or (event, callback, every)
+    if snapshot:
+        # Snapshots are taken between top-level statements of a serial run; with `resume`
+        # the run continues from the snapshot file if it exists
+        runner = SnapshotRunner(interpreter, snapshot, snapshot_every, source_digest(source_code, optimize))
+        start, result = runner.resume() if resume else (0, None)
+        result = runner.run(ast, start, result)
+    elif parallel:
+        # `parallel` is True to use every CPU, or the maximum number of worker processes
+        executor = ParallelExecutor(interpreter, workers=None if parallel is True else parallel)
+        result = executor.run(ast)
+        if debug:
+            print("\nГрупп выполнено параллельно:", executor.parallel_groups)
+    else:
+        result = interpreter.interpret(ast)
+    if debug and memoize:
+        print("\nМемоизация:")
+        for name, stats in interpreter.memo_stats().items():
+            print(name, stats)
     return result
 
+def run_stream(source, optimize=False, memoize=False):
+    # Each top-level statement is lexed, parsed, analyzed and executed before the next
+    # one is read, then discarded. `source` may be a string or an iterable of lines.
+    inferencer = TypeInferencer()
+    optimizer = Optimizer() if optimize else None
+
+    def analyzed(statements):
+        for statement in statements:
+            inferencer.infer([statement])
+            if optimizer:
+                # Temporaries never outlive the statement they were introduced for, so
+                # their slots are reused instead of growing with the script
+                optimizer.next_slot = 0
+                optimizer.optimize([statement])
+            yield statement
+            interpreter.temporaries.clear()
+
+    parser = StreamingParser(Lexer(source).iter_tokens())
+    interpreter = Interpreter(memoize=memoize)
+    return interpreter.interpret(analyzed(parser.parse_iter()))
+
 if __name__ == "__main__":
     print("Введите код программы построчно. Для завершения ввода введите пустую строку.")
     lines = []
@@ -0,0 +1,433 @@
+from ast import *
+from analysis import assigned_names, child_nodes, clone, read_names
+from type_inference import LOGICAL_OPS, NUMERIC_TYPES
+
+
+def expression_key(node):
+    """
+    Builds a structural key for a side-effect-free expression.
+
+    Two expressions with the same key compute the same value as long as none of
+    the names they read are reassigned in between.
+
+    Args:
+        node (ASTNode): The expression.
+
+    Returns:
+        tuple or None: The key, or None if the expression is not pure.
+    """
+    if isinstance(node, NumberNode):
+        return ('number', type(node.value), node.value)
+    if isinstance(node, VarAccessNode):
+        return ('var', node.name)
+    if isinstance(node, TempAccessNode):
+        return ('temp', node.slot)
+    if isinstance(node, BinOpNode):
+        left = expression_key(node.left)
+        right = expression_key(node.right) if left is not None else None
+        if right is not None:
+            return (node.op, left, right)
+    return None
+
+
+def is_numeric(node):
+    """
+    Checks that every part of a pure expression was inferred to be a number or boolean.
+
+    Such expressions never raise on '+', '-', '*' or comparisons and never produce
+    an array, so their values can be shared safely.
+
+    Args:
+        node (ASTNode): A pure expression.
+
+    Returns:
+        bool: True if all operands and intermediate results are numeric.
+    """
+    if isinstance(node, BinOpNode):
+        return node.inferred_type in NUMERIC_TYPES and is_numeric(node.left) and is_numeric(node.right)
+    return isinstance(node, NumberNode) or node.inferred_type in NUMERIC_TYPES
+
+
+def cannot_raise(node):
+    """
+    Checks that evaluating a numeric expression cannot raise.
+
+    Only division can fail, so it is allowed only by a non-zero literal.
+
+    Args:
+        node (ASTNode): A pure numeric expression.
+
+    Returns:
+        bool: True if evaluation always succeeds.
+    """
+    if isinstance(node, BinOpNode):
+        if node.op == '/' and not (isinstance(node.right, NumberNode) and node.right.value != 0):
+            return False
+        return cannot_raise(node.left) and cannot_raise(node.right)
+    return True
+
+
+class Optimizer:
+    """
+    AST optimizer performing loop-invariant code motion and common-subexpression elimination.
+
+    The optimizer relies on the annotations of the type inference pass, so
+    `TypeInferencer.infer` must be run on the statements first. Computed values are
+    kept in temporaries (TempAssignNode/TempAccessNode), which are stored apart from
+    program variables, so the final variable state is the same as without optimization.
+
+    Attributes:
+        next_slot (int): Number of the next free temporary.
+    """
+
+    def __init__(self):
+        """
+        Initializes the optimizer.
+        """
+        self.next_slot = 0
+
+    def new_temp(self):
+        """
+        Allocates a new temporary.
+
+        Returns:
+            int: The slot number of the temporary.
+        """
+        slot = self.next_slot
+        self.next_slot += 1
+        return slot
+
+    def optimize(self, statements):
+        """
+        Optimizes a list of top-level statements in place.
+
+        Args:
+            statements (list of ASTNode): The program to optimize.
+
+        Returns:
+            list of ASTNode: The optimized statements.
+        """
+        self.hoist_block(statements)
+        self.eliminate_block(statements)
+        self.specialize_block(statements)
+        return statements
+
+    def hoist_block(self, statements):
+        """
+        Hoists invariant expressions out of every loop in a block, innermost loops first.
+
+        Args:
+            statements (list of ASTNode): The block to transform in place.
+        """
+        for statement in statements:
+            if isinstance(statement, WhileNode):
+                self.hoist_block(statement.body)
+                self.hoist_invariants(statement)
+            elif isinstance(statement, IfNode):
+                self.hoist_block(statement.if_body)
+                self.hoist_block(statement.else_body or [])
+            elif isinstance(statement, (ForNode, DoWhileNode)):
+                self.hoist_block(statement.body)
+
+    def eliminate_block(self, statements):
+        """
+        Eliminates common subexpressions in a block and in all blocks nested in it.
+
+        Args:
+            statements (list of ASTNode): The block to transform in place.
+        """
+        for statement in statements:
+            if isinstance(statement, WhileNode):
+                self.eliminate_block(statement.body)
+            elif isinstance(statement, IfNode):
+                self.eliminate_block(statement.if_body)
+                self.eliminate_block(statement.else_body or [])
+            elif isinstance(statement, (ForNode, DoWhileNode)):
+                self.eliminate_block(statement.body)
+        self.eliminate_common_subexpressions(statements)
+
+    def specialize_block(self, statements):
+        """
+        Adds bounds-check-free versions to every eligible loop in a block, innermost loops first.
+
+        Args:
+            statements (list of ASTNode): The block to transform in place.
+        """
+        for statement in statements:
+            if isinstance(statement, WhileNode):
+                self.specialize_block(statement.body)
+                self.eliminate_bounds_checks(statement)
+            elif isinstance(statement, IfNode):
+                self.specialize_block(statement.if_body)
+                self.specialize_block(statement.else_body or [])
+            elif isinstance(statement, (ForNode, DoWhileNode)):
+                self.specialize_block(statement.body)
+
+    def eliminate_bounds_checks(self, loop):
+        """
+        Creates an unchecked version of a counted loop's body for accesses by the induction variable.
+
+        The loop must have the form `while (i < n) { ...; i = i + c; ... }` (or '<=',
+        or with the operands swapped), where `n` is an integer literal or a variable
+        not assigned in the loop, `c` is a positive integer literal and the increment
+        is the only assignment to `i`. Accesses `a[i]` placed before the increment,
+        to arrays not reassigned in the loop, then stay within [i0, n) for the entry
+        value i0. On loop entry the interpreter checks once that `i` and `n` are
+        integers and that every such array is a list covering that range; only then
+        is `fast_body` executed, so failing programs still get the usual errors.
+
+        Args:
+            loop (WhileNode): The loop to transform in place.
+        """
+        condition = loop.condition
+        if not isinstance(condition, BinOpNode):
+            return
+        if condition.op in ('<', '<='):
+            index, bound, inclusive = condition.left, condition.right, condition.op == '<='
+        elif condition.op in ('>', '>='):
+            index, bound, inclusive = condition.right, condition.left, condition.op == '>='
+        else:
+            return
+        if not isinstance(index, VarAccessNode):
+            return
+        name = index.name
+        step = next((position for position, statement in enumerate(loop.body)
+                     if self.is_increment(statement, name)), None)
+        if step is None:
+            return
+        others = [condition] + loop.preheader + loop.body[:step] + loop.body[step + 1:]
+        written = assigned_names(others)
+        if name in written:
+            return
+        if isinstance(bound, VarAccessNode):
+            if bound.name in written or bound.name == name:
+                return
+        elif not (isinstance(bound, NumberNode) and type(bound.value) is int):
+            return
+
+        def is_safe_site(node):
+            return (isinstance(node, (IndexAccessNode, IndexAssignNode))
+                    and isinstance(node.index, VarAccessNode) and node.index.name == name
+                    and node.array_name not in written)
+
+        arrays = set()
+
+        def replace(node):
+            if not is_safe_site(node):
+                return None
+            arrays.add(node.array_name)
+            if isinstance(node, IndexAccessNode):
+                unchecked = UncheckedIndexAccessNode(node.array_name, node.index)
+            else:
+                unchecked = UncheckedIndexAssignNode(node.array_name, node.index, self.rewrite(node.value, replace))
+            unchecked.line, unchecked.inferred_type = node.line, node.inferred_type
+            return unchecked
+
+        fast_body = [self.rewrite(clone(statement), replace) for statement in loop.body[:step]]
+        if arrays:
+            loop.fast_body = fast_body + loop.body[step:]
+            loop.bounds_guard = (name, bound, inclusive, sorted(arrays))
+
+    def is_increment(self, node, name):
+        """
+        Checks whether a statement increments a variable by a positive integer literal.
+
+        Args:
+            node (ASTNode): The statement.
+            name (str): The variable name.
+
+        Returns:
+            bool: True for `name = name + c` or `name = c + name` with an integer c > 0.
+        """
+        if not (isinstance(node, VarAssignNode) and node.name == name
+                and isinstance(node.value, BinOpNode) and node.value.op == '+'):
+            return False
+        operands = (node.value.left, node.value.right)
+        variable = [operand for operand in operands if isinstance(operand, VarAccessNode) and operand.name == name]
+        literal = [operand for operand in operands
+                   if isinstance(operand, NumberNode) and type(operand.value) is int and operand.value > 0]
+        return len(variable) == 1 and len(literal) == 1
+
+    def rewrite(self, node, replace):
+        """
+        Applies a replacement function to the expressions of a subtree, top-down.
+
+        Children are visited in evaluation order. When `replace` returns a node, it
+        takes the place of the expression and its children are not visited.
+
+        Args:
+            node (ASTNode): The root of the subtree.
+            replace (callable): Maps an expression to its replacement or None.
+
+        Returns:
+            ASTNode: The node itself or its replacement.
+        """
+        replacement = replace(node)
+        if replacement is not None:
+            return replacement
+        if isinstance(node, BinOpNode):
+            node.left = self.rewrite(node.left, replace)
+            node.right = self.rewrite(node.right, replace)
+        elif isinstance(node, (VarAssignNode, TempAssignNode)):
+            node.value = self.rewrite(node.value, replace)
+        elif isinstance(node, IndexAccessNode):
+            node.index = self.rewrite(node.index, replace)
+        elif isinstance(node, IndexAssignNode):
+            node.index = self.rewrite(node.index, replace)
+            node.value = self.rewrite(node.value, replace)
+        elif isinstance(node, ArrayLiteralNode):
+            node.elements = [self.rewrite(element, replace) for element in node.elements]
+        elif isinstance(node, CallNode):
+            node.args = [self.rewrite(arg, replace) for arg in node.args]
+        elif isinstance(node, WhileNode):
+            node.condition = self.rewrite(node.condition, replace)
+            node.preheader = [self.rewrite(statement, replace) for statement in node.preheader]
+            node.body = [self.rewrite(statement, replace) for statement in node.body]
+            if node.fast_body is not None:
+                node.fast_body = [self.rewrite(statement, replace) for statement in node.fast_body]
+        elif isinstance(node, ForNode):
+            node.init = self.rewrite(node.init, replace) if node.init is not None else None
+            node.condition = self.rewrite(node.condition, replace)
+            node.body = [self.rewrite(statement, replace) for statement in node.body]
+            node.step = self.rewrite(node.step, replace) if node.step is not None else None
+        elif isinstance(node, DoWhileNode):
+            node.body = [self.rewrite(statement, replace) for statement in node.body]
+            node.condition = self.rewrite(node.condition, replace)
+        elif isinstance(node, IfNode):
+            node.condition = self.rewrite(node.condition, replace)
+            node.if_body = [self.rewrite(statement, replace) for statement in node.if_body]
+            if node.else_body:
+                node.else_body = [self.rewrite(statement, replace) for statement in node.else_body]
+        return node
+
+    def hoist_invariants(self, loop):
+        """
+        Moves loop-invariant expressions of a 'while' body into its preheader.
+
+        An expression is hoisted when it is pure, numeric, cannot raise and reads no
+        name assigned anywhere in the loop. The preheader runs only if the loop is
+        entered, and identical invariant expressions share one temporary.
+
+        Args:
+            loop (WhileNode): The loop to transform in place.
+        """
+        written = assigned_names([loop.condition] + loop.preheader + loop.body)
+        hoisted = {}
+
+        def replace(node):
+            if not isinstance(node, BinOpNode):
+                return None
+            key = expression_key(node)
+            if key is None or not is_numeric(node) or not cannot_raise(node) or read_names(node) & written:
+                return None
+            if key not in hoisted:
+                slot = self.new_temp()
+                hoisted[key] = slot
+                loop.preheader.append(TempAssignNode(slot, node))
+            return self.temp_access(hoisted[key], node)
+
+        loop.body = [self.rewrite(statement, replace) for statement in loop.body]
+
+    def eliminate_common_subexpressions(self, statements):
+        """
+        Computes repeated pure expressions of a straight-line block only once.
+
+        The first occurrence stores its value in a temporary and later occurrences
+        read it, as long as none of the names involved is reassigned in between.
+        Loops, conditionals and statements with nested assignments end the reuse of
+        everything they assign.
+
+        Args:
+            statements (list of ASTNode): The block to transform in place.
+        """
+        # First pass: number the values and count how often each one is computed
+        value_ids = {}
+        counts = []
+        available = {}
+
+        def number(node):
+            if isinstance(node, BinOpNode):
+                key = expression_key(node)
+                if key is not None and is_numeric(node):
+                    if key in available:
+                        value_ids[id(node)] = available[key][0]
+                        counts[available[key][0]] += 1
+                        return
+                    number_operands(node)
+                    value_ids[id(node)] = len(counts)
+                    available[key] = (len(counts), read_names(node))
+                    counts.append(1)
+                    return
+                number_operands(node)
+                return
+            for child in child_nodes(node):
+                number(child)
+
+        def number_operands(node):
+            number(node.left)
+            if node.op in LOGICAL_OPS:
+                # The right operand of '&&'/'||' may be skipped, so values first computed there
+                # cannot be reused after it
+                before = dict(available)
+                number(node.right)
+                available.clear()
+                available.update(before)
+            else:
+                number(node.right)
+
+        for statement in statements:
+            written = assigned_names(statement)
+            if self.is_simple_statement(statement):
+                number(statement)
+            for key in [key for key, (_, names) in available.items() if names & written]:
+                del available[key]
+
+        # Second pass: store values computed more than once and reuse them
+        slots = {}
+
+        def replace(node):
+            value_id = value_ids.get(id(node))
+            if value_id is None or counts[value_id] < 2:
+                return None
+            if value_id in slots:
+                return self.temp_access(slots[value_id], node)
+            slots[value_id] = self.new_temp()
+            node.left = self.rewrite(node.left, replace)
+            node.right = self.rewrite(node.right, replace)
+            stored = TempAssignNode(slots[value_id], node)
+            stored.inferred_type = node.inferred_type
+            return stored
+
+        for index, statement in enumerate(statements):
+            if self.is_simple_statement(statement):
+                statements[index] = self.rewrite(statement, replace)
+
+    def is_simple_statement(self, node):
+        """
+        Checks whether a statement is straight-line code without nested assignments.
+
+        Args:
+            node (ASTNode): The statement.
+
+        Returns:
+            bool: True if the statement's expressions can take part in CSE.
+        """
+        if isinstance(node, (WhileNode, IfNode, ForNode, DoWhileNode)) or not isinstance(node, ASTNode):
+            return False
+        expressions = child_nodes(node) if isinstance(node, VarAssignNode) else [node]
+        return not any(assigned_names(expression) for expression in expressions)
+
+    def temp_access(self, slot, expression):
+        """
+        Creates a read of a temporary holding the value of an expression.
+
+        Args:
+            slot (int): The slot number of the temporary.
+            expression (ASTNode): The expression whose value the temporary holds.
+
+        Returns:
+            TempAccessNode: The new node, typed like the expression.
+        """
+        node = TempAccessNode(slot)
+        node.inferred_type = expression.inferred_type
+        return node
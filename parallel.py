@@ -0,0 +1,303 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ast import *
+from analysis import assigned_names, read_names, walk
+from strings import Rope
+from type_inference import NUMERIC_TYPES, STRING
+
+LOOP_NODES = (WhileNode, ForNode, DoWhileNode)
+
+# Values of these types are immutable, so copies returned by a worker are indistinguishable
+SCALAR_TYPES = NUMERIC_TYPES | {STRING}
+
+# Interpreter and statements of the batch being run, inherited by forked workers
+_forked_batch = None
+
+
+def statement_effects(statement):
+    """
+    Collects the names a top-level statement reads and writes.
+
+    A write into an array element counts as a write of the array name.
+
+    Args:
+        statement (ASTNode): The statement to inspect.
+
+    Returns:
+        tuple: The set of read names and the set of written names.
+    """
+    writes = assigned_names(statement)
+    writes |= {node.array_name for node in walk(statement) if isinstance(node, IndexAssignNode)}
+    return read_names(statement), writes
+
+
+def is_barrier(statement):
+    """
+    Checks whether a statement must run alone, in order, in the main process.
+
+    Function bodies read and write globals that the name analysis cannot see, so
+    definitions and every statement containing a call are barriers.
+
+    Args:
+        statement (ASTNode): The statement to inspect.
+
+    Returns:
+        bool: True if the statement is a barrier.
+    """
+    return any(isinstance(node, (FunctionDefNode, CallNode)) for node in walk(statement))
+
+
+def parallel_stages(statements):
+    """
+    Splits statements into stages of groups that share no variable with each other.
+
+    Two statements conflict if one writes a name the other reads or writes. A
+    statement joins the groups of the current stage it conflicts with, merging
+    them, or starts a new group if it conflicts with none. A statement that
+    conflicts with several groups containing loops would serialize them, so it
+    starts the next stage instead. The groups of a stage may therefore run in any
+    order relative to each other, while each group keeps the program order of its
+    statements.
+
+    Args:
+        statements (list of ASTNode): Statements without barriers.
+
+    Returns:
+        list of list of list of int: For each stage, the statement indices of each group.
+    """
+    stages = []
+    groups = []  # [indices, reads, writes, has_loop] for each group of the current stage
+    for index, statement in enumerate(statements):
+        reads, writes = statement_effects(statement)
+        has_loop = any(isinstance(node, LOOP_NODES) for node in walk(statement))
+        conflicting = [group for group in groups if group[2] & (reads | writes) or group[1] & writes]
+        if sum(group[3] for group in conflicting) > 1:
+            stages.append([group[0] for group in groups])
+            groups, conflicting = [], []
+        indices = sorted([index] + [other for group in conflicting for other in group[0]])
+        for group in conflicting:
+            reads |= group[1]
+            writes |= group[2]
+            has_loop = has_loop or group[3]
+        groups = [group for group in groups if all(group is not other for other in conflicting)] + \
+            [[indices, reads, writes, has_loop]]
+    if groups:
+        stages.append([group[0] for group in groups])
+    return stages
+
+
+def runs_in_worker(statements, batch_mutates_arrays):
+    """
+    Checks whether a group of statements is worth running in a worker and safe to run there.
+
+    The group must contain a loop. It may only assign values inferred to be scalars,
+    which a worker can send back without losing aliasing between arrays, and must
+    not write into arrays. If another statement of the batch writes into an array,
+    the group must not read arrays either, since the worker would see a stale copy.
+
+    Args:
+        statements (list of ASTNode): The statements of the group.
+        batch_mutates_arrays (bool): Whether any statement of the batch writes into an array.
+
+    Returns:
+        bool: True if the group can run in a worker process.
+    """
+    has_loop = False
+    for node in walk(statements):
+        if isinstance(node, LOOP_NODES):
+            has_loop = True
+        elif isinstance(node, IndexAssignNode):
+            return False
+        elif isinstance(node, VarAssignNode) and node.inferred_type not in SCALAR_TYPES:
+            return False
+        elif batch_mutates_arrays and (isinstance(node, IndexAccessNode) or
+                                       isinstance(node, VarAccessNode) and node.inferred_type not in SCALAR_TYPES):
+            return False
+    return has_loop
+
+
+def run_group(interpreter, statements, indices):
+    """
+    Runs some statements of a batch in program order.
+
+    Args:
+        interpreter (Interpreter): The interpreter to run them with.
+        statements (list of ASTNode): The statements of the batch.
+        indices (list of int): Indices of the statements to run, in increasing order.
+
+    Returns:
+        tuple: (index of the failed statement or None, the exception or None,
+        value of the last statement run).
+    """
+    result = None
+    for index in indices:
+        try:
+            result = interpreter.interpret_node(statements[index])
+        except Exception as error:
+            return index, error, None
+    return None, None, result
+
+
+def _run_group_in_worker(indices):
+    """
+    Runs a group in a forked worker on the interpreter state inherited from the main process.
+
+    Args:
+        indices (list of int): Indices of the group's statements in the forked batch.
+
+    Returns:
+        tuple: The `run_group` outcome followed by the variables and temporaries the
+        group assigned, or None instead of them if a statement failed.
+    """
+    interpreter, statements = _forked_batch
+    variables_before, temporaries_before = dict(interpreter.variables), dict(interpreter.temporaries)
+    error_index, error, result = run_group(interpreter, statements, indices)
+    if error is not None:
+        return error_index, error, result, None
+    # Only bindings that were actually assigned are sent back: an assignment that never ran
+    # must not replace a value, such as an array shared with another variable, by a copy
+    variables = {name: value for name, value in interpreter.variables.items()
+                 if name not in variables_before or variables_before[name] is not value}
+    temporaries = {slot: value for slot, value in interpreter.temporaries.items()
+                   if slot not in temporaries_before or temporaries_before[slot] is not value}
+    return None, None, result, (variables, temporaries)
+
+
+class ParallelExecutor:
+    """
+    Runs a program's top-level statements, executing independent loops in worker processes.
+
+    The statements between two barriers form a batch, which is split into stages
+    of groups that share no variables (see `parallel_stages`). Groups that contain
+    a loop and only compute scalars run concurrently in worker processes forked
+    from the current state. The rest of the batch runs in the main process
+    meanwhile, and the variables the workers assigned are merged back afterwards. Results and variables are the same as with serial
+    execution; if several statements fail, the error of the first one in program
+    order is raised, although independent statements after it may have run.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter holding the program state.
+        workers (int): Maximum number of worker processes.
+        parallel_groups (int): Number of groups that ran in workers so far.
+    """
+
+    def __init__(self, interpreter, workers=None):
+        """
+        Initializes the executor.
+
+        Args:
+            interpreter (Interpreter): The interpreter to run statements with.
+            workers (int, optional): Maximum number of worker processes; defaults to the CPU count.
+        """
+        self.interpreter = interpreter
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_groups = 0
+
+    def run(self, statements):
+        """
+        Runs a program.
+
+        Args:
+            statements (list of ASTNode): The top-level statements.
+
+        Returns:
+            result: The result of the last executed statement.
+        """
+        result = None
+        batch = []
+        for statement in statements:
+            if is_barrier(statement):
+                result = self.run_batch(batch, result)
+                batch = []
+                result = self.interpreter.interpret_node(statement)
+            else:
+                batch.append(statement)
+        result = self.run_batch(batch, result)
+        return str(result) if type(result) is Rope else result
+
+    def run_batch(self, statements, result):
+        """
+        Runs a batch of statements that contains no barrier.
+
+        Args:
+            statements (list of ASTNode): The batch.
+            result: The result of the previous statement, returned for an empty batch.
+
+        Returns:
+            result: The result of the last statement of the batch.
+        """
+        for groups in parallel_stages(statements):
+            result = self.run_stage(statements, groups)
+        return result
+
+    def run_stage(self, statements, groups):
+        """
+        Runs one stage of a batch, with eligible groups in worker processes.
+
+        Args:
+            statements (list of ASTNode): The batch.
+            groups (list of list of int): Statement indices of each group of the stage.
+
+        Returns:
+            result: The result of the last statement of the stage.
+
+        Raises:
+            Exception: The error of the first failing statement in program order.
+        """
+        indices = sorted(index for group in groups for index in group)
+        mutates_arrays = any(isinstance(node, IndexAssignNode)
+                             for node in walk([statements[index] for index in indices]))
+        offloaded = [group for group in groups
+                     if runs_in_worker([statements[index] for index in group], mutates_arrays)]
+        if (len(offloaded) < 2 or self.workers < 2 or any(self.interpreter.hooks.values())
+                or "fork" not in multiprocessing.get_all_start_methods()):
+            result = None
+            for index in indices:
+                result = self.interpreter.interpret_node(statements[index])
+            return result
+
+        global _forked_batch
+        in_workers = {index for group in offloaded for index in group}
+        local = [index for index in indices if index not in in_workers]
+        last = indices[-1]
+        result = None
+        _forked_batch = (self.interpreter, statements)
+        try:
+            # Workers are forked on the first submit, before the main process changes any state
+            with ProcessPoolExecutor(min(self.workers, len(offloaded)),
+                                     mp_context=multiprocessing.get_context("fork")) as pool:
+                futures = [pool.submit(_run_group_in_worker, group) for group in offloaded]
+                failed_at, error, value = run_group(self.interpreter, statements, local)
+                outcomes = []
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except BrokenProcessPool:
+                        outcomes.append(None)
+        finally:
+            _forked_batch = None
+        if error is None and local and local[-1] == last:
+            result = value
+
+        for group, outcome in zip(offloaded, outcomes):
+            if outcome is None:
+                # The worker died: the group is independent of everything else, so run it here
+                outcome = run_group(self.interpreter, statements, group) + (None,)
+            else:
+                self.parallel_groups += 1
+            group_failed_at, group_error, value, written = outcome
+            if group_error is not None:
+                if failed_at is None or group_failed_at < failed_at:
+                    failed_at, error = group_failed_at, group_error
+                continue
+            if written is not None:
+                self.interpreter.variables.update(written[0])
+                self.interpreter.temporaries.update(written[1])
+            if group[-1] == last:
+                result = value
+        if error is not None:
+            raise error
+        return result
@@ -1,3 +1,5 @@
+import sys
+
 from lexer import TokenType
 from ast import *
 
@@ -20,6 +22,7 @@ class Parser:
         """
         self.tokens = tokens
         self.pos = 0  # Position index in the token list
+        self.function_depth = 0  # Number of enclosing function bodies, for validating 'return'
 
     def parse(self):
         """
@@ -41,13 +44,21 @@ class Parser:
         Returns:
             ASTNode: The parsed statement node.
         """
-        token_type, token_value = self.current_token()[0], self.current_token()[1]
+        token_type, token_value, line = self.current_token()[:3]
 
         # Check for control structures or assignments and call respective parse methods
         if token_type == TokenType.KEYWORD and token_value == "while":
             statement = self.parse_while()
+        elif token_type == TokenType.KEYWORD and token_value == "for":
+            statement = self.parse_for()
+        elif token_type == TokenType.KEYWORD and token_value == "do":
+            statement = self.parse_do_while()
         elif token_type == TokenType.KEYWORD and token_value == "if":
             statement = self.parse_if()
+        elif token_type == TokenType.KEYWORD and token_value == "function":
+            statement = self.parse_function()
+        elif token_type == TokenType.KEYWORD and token_value == "return":
+            statement = self.parse_return()
         elif token_type == TokenType.IDENTIFIER:
             statement = self.parse_assignment_or_variable()
         else:
@@ -57,6 +68,10 @@ class Parser:
         if self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ";":
             self.consume()
 
+        # Remember where the statement starts for diagnostics and debug dumps
+        if isinstance(statement, ASTNode):
+            statement.line = line
+
         return statement
 
     def parse_if(self):
@@ -102,6 +117,91 @@ class Parser:
         body = self.parse_block_or_statement()
         return WhileNode(condition, body)
 
+    def parse_for(self):
+        """
+        Parses a 'for (init; condition; step)' loop; the init and step parts may be empty.
+
+        Returns:
+            ForNode: An AST node representing the 'for' loop.
+        """
+        self.consume()  # Consume 'for' keyword
+        self.consume(TokenType.PUNCTUATION, '(')
+
+        init = None
+        if not (self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ';'):
+            init = self.expr()
+        self.consume(TokenType.PUNCTUATION, ';')
+
+        condition = self.expr()
+        self.consume(TokenType.PUNCTUATION, ';')
+
+        step = None
+        if not (self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ')'):
+            step = self.expr()
+        self.consume(TokenType.PUNCTUATION, ')')
+
+        body = self.parse_block_or_statement()
+        return ForNode(init, condition, step, body)
+
+    def parse_do_while(self):
+        """
+        Parses a 'do ... while (condition)' loop.
+
+        Returns:
+            DoWhileNode: An AST node representing the 'do-while' loop.
+        """
+        self.consume()  # Consume 'do' keyword
+        body = self.parse_block_or_statement()
+        self.consume(TokenType.KEYWORD, 'while')
+        self.consume(TokenType.PUNCTUATION, '(')
+        condition = self.expr()
+        self.consume(TokenType.PUNCTUATION, ')')
+        return DoWhileNode(body, condition)
+
+    def parse_function(self):
+        """
+        Parses a function definition: 'function' name '(' parameters ')' block.
+
+        Returns:
+            FunctionDefNode: An AST node representing the function definition.
+        """
+        self.consume()  # Consume 'function' keyword
+        name = self.consume(TokenType.IDENTIFIER)[1]
+        self.consume(TokenType.PUNCTUATION, '(')
+
+        # Parse the comma-separated parameter names
+        params = []
+        if not (self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ')'):
+            params.append(self.consume(TokenType.IDENTIFIER)[1])
+            while self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ',':
+                self.consume()
+                params.append(self.consume(TokenType.IDENTIFIER)[1])
+        self.consume(TokenType.PUNCTUATION, ')')
+
+        self.function_depth += 1
+        try:
+            body = self.parse_block()
+        finally:
+            self.function_depth -= 1
+        return FunctionDefNode(name, params, body)
+
+    def parse_return(self):
+        """
+        Parses a 'return' statement with an optional value.
+
+        Returns:
+            ReturnNode: An AST node representing the 'return' statement.
+
+        Raises:
+            ValueError: If 'return' appears outside a function body.
+        """
+        token = self.consume()  # Consume 'return' keyword
+        if self.function_depth == 0:
+            raise ValueError(f"'return' вне функции в строке {token[2]}, колонка {token[3]}")
+        if self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] in (';', '}'):
+            return ReturnNode()
+        return ReturnNode(self.expr())
+
     def parse_block_or_statement(self):
         """
         Parses either a block of statements enclosed in braces or a single statement.
@@ -151,15 +251,59 @@ class Parser:
 
     def expr(self):
         """
-        Parses an expression, handling operators with lower precedence (e.g., +, -).
+        Parses an expression, starting with the operator of lowest precedence ('||').
+
+        Precedence from lowest to highest: '||', '&&', comparisons, '+' and '-',
+        '*' and '/'. All binary operators are left-associative.
+
+        Returns:
+            ASTNode: A node representing the parsed expression.
+        """
+        left = self.logical_and()
+        while self.current_token()[0] == TokenType.LOGICAL and self.current_token()[1] == '||':
+            op = self.consume()
+            right = self.logical_and()
+            left = BinOpNode(left, op[1], right)
+        return left
+
+    def logical_and(self):
+        """
+        Parses a conjunction of comparisons joined by '&&'.
+
+        Returns:
+            ASTNode: A node representing the parsed expression.
+        """
+        left = self.comparison()
+        while self.current_token()[0] == TokenType.LOGICAL and self.current_token()[1] == '&&':
+            op = self.consume()
+            right = self.comparison()
+            left = BinOpNode(left, op[1], right)
+        return left
+
+    def comparison(self):
+        """
+        Parses comparisons of sums (e.g., <, ==).
+
+        Returns:
+            ASTNode: A node representing the parsed expression.
+        """
+        left = self.arithmetic()
+        while self.current_token()[0] == TokenType.COMPARISON:
+            op = self.consume()
+            right = self.arithmetic()
+            left = BinOpNode(left, op[1], right)
+        return left
+
+    def arithmetic(self):
+        """
+        Parses a sum, handling operators with lower precedence than terms (e.g., +, -).
 
         Returns:
             ASTNode: A node representing the parsed expression.
         """
         left = self.term()
-        # Parse operators like + and - or logical/comparison operators
-        while self.current_token()[0] in {TokenType.COMPARISON, TokenType.LOGICAL} or \
-                (self.current_token()[0] == TokenType.OPERATOR and self.current_token()[1] in ('+', '-')):
+        # Parse + and - operators
+        while self.current_token()[0] == TokenType.OPERATOR and self.current_token()[1] in ('+', '-'):
             op = self.consume()  # Consume the operator
             right = self.term()  # Parse the right operand
             left = BinOpNode(left, op[1], right)  # Combine into a binary operation node
@@ -182,7 +326,7 @@ class Parser:
 
     def factor(self):
         """
-        Parses a factor, which is the smallest unit in an expression (number, variable, or expression in parentheses).
+        Parses a factor, which is the smallest unit in an expression (number, string, variable, or expression in parentheses).
 
         Returns:
             ASTNode: A node representing the parsed factor.
@@ -200,6 +344,11 @@ class Parser:
             self.consume()
             return NumberNode(float(token[1]))
 
+        # Handle strings: literals are interned, so equal literals share one object
+        elif token[0] == TokenType.STRING:
+            self.consume()
+            return StringNode(sys.intern(token[1][1:-1]))
+
         # Handle variables
         elif token[0] == TokenType.IDENTIFIER:
             return self.parse_assignment_or_variable()
@@ -272,8 +421,11 @@ class Parser:
         var_name = self.current_token()[1]
         self.consume(TokenType.IDENTIFIER)
 
+        # Проверка на вызов функции
+        if self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == '(':
+            return CallNode(var_name, self.parse_arguments())
         # Проверка на индексацию массива
-        if self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == '[':
+        elif self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == '[':
             index = self.parse_index()
             # Проверка на присваивание
             if self.current_token()[0] == TokenType.ASSIGN:
@@ -289,6 +441,21 @@ class Parser:
         else:
             return VarAccessNode(var_name)
 
+    def parse_arguments(self):
+        self.consume(TokenType.PUNCTUATION, '(')
+        args = []
+        if self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ')':
+            self.consume(TokenType.PUNCTUATION, ')')
+            return args
+        while True:
+            args.append(self.expr())
+            if self.current_token()[0] == TokenType.PUNCTUATION and self.current_token()[1] == ',':
+                self.consume(TokenType.PUNCTUATION, ',')
+            else:
+                break
+        self.consume(TokenType.PUNCTUATION, ')')
+        return args
+
     def parse_index(self):
         self.consume(TokenType.PUNCTUATION, '[')
         index_expr = self.expr()
@@ -310,3 +477,69 @@ class Parser:
                 break
         self.consume(TokenType.PUNCTUATION, ']')
         return ArrayLiteralNode(elements)
+
+
+class StreamingParser(Parser):
+    """
+    Parser reading tokens lazily from an iterator and yielding one top-level statement at a time.
+
+    Only the tokens of the statement being parsed are buffered, so memory use is
+    bounded by the largest statement rather than by the whole program.
+    """
+
+    def __init__(self, tokens):
+        """
+        Initializes the parser with a token iterator.
+
+        Args:
+            tokens (iterable): Tokens produced by the lexer, ending with an EOF token.
+        """
+        super().__init__([])
+        self.stream = iter(tokens)
+
+    def parse_iter(self):
+        """
+        Parses top-level statements one by one.
+
+        Yields:
+            ASTNode: Each parsed top-level statement, in source order.
+        """
+        while self.current_token()[0] != TokenType.EOF:
+            statement = self.parse_statement()
+            # Drop the tokens of the finished statement
+            del self.tokens[:self.pos]
+            self.pos = 0
+            yield statement
+
+    def parse(self):
+        """
+        Parses all remaining tokens into a list of statement nodes.
+
+        Returns:
+            list: A list of parsed AST nodes.
+        """
+        return list(self.parse_iter())
+
+    def current_token(self):
+        """
+        Retrieves the current token, reading it from the stream if needed.
+
+        Returns:
+            tuple: The current token.
+        """
+        while self.pos >= len(self.tokens):
+            self.tokens.append(next(self.stream))
+        return self.tokens[self.pos]
+
+    def peek_next_token(self):
+        """
+        Returns the next token without consuming it, reading it from the stream if needed.
+
+        Returns:
+            tuple: The next token or (TokenType.EOF, None) if at the end.
+        """
+        if self.current_token()[0] == TokenType.EOF:
+            return (TokenType.EOF, None)
+        while self.pos + 1 >= len(self.tokens):
+            self.tokens.append(next(self.stream))
+        return self.tokens[self.pos + 1]
@@ -0,0 +1,294 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+from analysis import clone, pure_functions
+from interpreter import MemoCache
+from strings import Rope
+
+SNAPSHOT_MAGIC = b"ISNAP\x00\x00\x01"
+
+# Magic, byte order of the array data (0 little-endian, 1 big-endian), length of the metadata
+HEADER = struct.Struct("<8sBQ")
+
+# Arrays whose elements all have one of these types are written as raw machine values
+BULK_TYPECODES = {int: "q", float: "d"}
+BULK_ITEMSIZE = 8
+
+
+def source_digest(source_code, optimize=False):
+    """
+    Computes the fingerprint of a program, used to check that a snapshot belongs to it.
+
+    The optimizer setting is part of the fingerprint: the temporaries saved in a
+    snapshot only exist in the optimized program.
+
+    Args:
+        source_code (str): The program source.
+        optimize (bool, optional): Whether the program is run with the optimizer.
+
+    Returns:
+        str: Hex SHA-256 digest of the source and the setting.
+    """
+    return hashlib.sha256(f"optimize={bool(optimize)}\n{source_code}".encode()).hexdigest()
+
+
+def bulk_typecode(kinds):
+    """
+    Chooses how an array is stored in a snapshot.
+
+    Args:
+        kinds (set of type): The types of the array elements.
+
+    Returns:
+        str or None: The `array` typecode for raw storage, or None if the array must be pickled.
+    """
+    if not kinds:
+        return "q"
+    return BULK_TYPECODES.get(kinds.pop()) if len(kinds) == 1 else None
+
+
+class Snapshot:
+    """
+    State of an interpreter between two top-level statements.
+
+    On disk a snapshot is a fixed header, pickled metadata (scalar variables,
+    temporaries, functions, the position and the last result) and a data section
+    with every array of only integers or only floats stored as raw 8-byte values.
+    Loading maps the file and converts each array with a single `tolist()` call
+    instead of unpickling its elements one by one. Arrays bound to several names
+    are stored once and restored as one shared list. Snapshots are pickles, so
+    only load files from trusted sources.
+
+    Attributes:
+        variables (dict): Global variables.
+        temporaries (dict): Optimizer temporaries.
+        functions (dict): Function names mapped to FunctionDefNode objects.
+        position (int): Number of top-level statements already executed.
+        result: The result of the last executed statement.
+        digest (str or None): Fingerprint of the program, see `source_digest`.
+    """
+
+    def __init__(self, variables, temporaries, functions, position=0, result=None, digest=None):
+        """
+        Initializes a snapshot.
+
+        Args:
+            variables (dict): Global variables.
+            temporaries (dict): Optimizer temporaries.
+            functions (dict): Function names mapped to FunctionDefNode objects.
+            position (int, optional): Number of top-level statements already executed.
+            result (optional): The result of the last executed statement.
+            digest (str, optional): Fingerprint of the program.
+        """
+        self.variables = variables
+        self.temporaries = temporaries
+        self.functions = functions
+        self.position = position
+        self.result = result
+        self.digest = digest
+
+    @classmethod
+    def capture(cls, interpreter, position=0, result=None, digest=None):
+        """
+        Takes a snapshot of an interpreter that is not inside a function call.
+
+        Args:
+            interpreter (Interpreter): The interpreter.
+            position (int, optional): Number of top-level statements already executed.
+            result (optional): The result of the last executed statement.
+            digest (str, optional): Fingerprint of the program.
+
+        Returns:
+            Snapshot: The snapshot, sharing values with the interpreter.
+        """
+        return cls(dict(interpreter.globals), dict(interpreter.temporaries), dict(interpreter.functions),
+                   position, result, digest)
+
+    def restore(self, interpreter):
+        """
+        Replaces the state of an interpreter with the snapshot.
+
+        Args:
+            interpreter (Interpreter): The interpreter, not inside a function call.
+        """
+        interpreter.globals.clear()
+        interpreter.globals.update(self.variables)
+        interpreter.temporaries.clear()
+        interpreter.temporaries.update(self.temporaries)
+        interpreter.functions = dict(self.functions)
+        if interpreter.memoize:
+            interpreter.memo_caches = {name: MemoCache(interpreter.memo_size)
+                                       for name in pure_functions(interpreter.functions)}
+
+    def save(self, path):
+        """
+        Writes the snapshot to a file.
+
+        The file is written next to the target and then renamed over it, so an
+        interrupted save never leaves a truncated snapshot behind.
+
+        Args:
+            path (str): The snapshot file.
+        """
+        values = {name: str(value) if type(value) is Rope else value for name, value in self.variables.items()}
+        values[None] = self.result  # The result is stored like a variable, so it may share an array
+        kinds = {id(value): set(map(type, value)) for value in values.values() if isinstance(value, list)}
+        # Nested arrays may share lists with other arrays, which only pickling all of them preserves
+        nested = any(list in element_types for element_types in kinds.values())
+        typecodes = {key: None if nested else bulk_typecode(element_types) for key, element_types in kinds.items()}
+
+        pickled, arrays, bulk, slots = {}, {}, [], {}
+        for name, value in values.items():
+            if not isinstance(value, list) or typecodes[id(value)] is None:
+                pickled[name] = value
+                continue
+            if id(value) not in slots:
+                try:
+                    data = array(typecodes[id(value)], value)
+                except OverflowError:
+                    pickled[name] = value  # Integers beyond 64 bits
+                    continue
+                slots[id(value)] = len(bulk)
+                bulk.append(data)
+            arrays[name] = slots[id(value)]
+
+        metadata = {
+            "variables": pickled,
+            "arrays": arrays,
+            "bulk": [(data.typecode, len(data)) for data in bulk],
+            "temporaries": self.temporaries,
+            "functions": {name: clone(function) for name, function in self.functions.items()},
+            "position": self.position,
+            "digest": self.digest,
+        }
+        payload = pickle.dumps(metadata, pickle.HIGHEST_PROTOCOL)
+        padding = -(HEADER.size + len(payload)) % BULK_ITEMSIZE
+
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(SNAPSHOT_MAGIC, sys.byteorder == "big", len(payload)))
+            file.write(payload)
+            file.write(b"\0" * padding)
+            for data in bulk:
+                data.tofile(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a snapshot from a file.
+
+        Args:
+            path (str): The snapshot file.
+
+        Returns:
+            Snapshot: The loaded snapshot.
+
+        Raises:
+            ValueError: If the file is not a snapshot or was written on a machine with another byte order.
+        """
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) != HEADER.size or header[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"Файл '{path}' не является снимком интерпретатора")
+            _, big_endian, length = HEADER.unpack(header)
+            if big_endian != (sys.byteorder == "big"):
+                raise ValueError(f"Снимок '{path}' записан с другим порядком байтов")
+            metadata = pickle.loads(file.read(length))
+
+            arrays = []
+            if metadata["bulk"]:
+                offset = HEADER.size + length + (-(HEADER.size + length) % BULK_ITEMSIZE)
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    for typecode, count in metadata["bulk"]:
+                        end = offset + count * BULK_ITEMSIZE
+                        with view[offset:end] as raw, raw.cast(typecode) as values:
+                            arrays.append(values.tolist())
+                        offset = end
+
+        variables = metadata["variables"]
+        variables.update((name, arrays[slot]) for name, slot in metadata["arrays"].items())
+        result = variables.pop(None)
+        return cls(variables, metadata["temporaries"], metadata["functions"], metadata["position"], result,
+                   metadata["digest"])
+
+
+class SnapshotRunner:
+    """
+    Runs top-level statements with periodic snapshots and resumes from them.
+
+    Attributes:
+        interpreter (Interpreter): The interpreter running the program.
+        path (str): The snapshot file.
+        every (int): A snapshot is saved after every this many statements; 0 disables it.
+        digest (str or None): Fingerprint of the program, see `source_digest`.
+    """
+
+    def __init__(self, interpreter, path, every=0, digest=None):
+        """
+        Initializes the runner.
+
+        Args:
+            interpreter (Interpreter): The interpreter running the program.
+            path (str): The snapshot file.
+            every (int, optional): Save a snapshot after every this many statements.
+            digest (str, optional): Fingerprint of the program, checked when resuming.
+        """
+        self.interpreter = interpreter
+        self.path = path
+        self.every = every
+        self.digest = digest
+
+    def save(self, position, result=None):
+        """
+        Saves a snapshot of the interpreter on demand.
+
+        Args:
+            position (int): Number of top-level statements already executed.
+            result (optional): The result of the last executed statement.
+        """
+        Snapshot.capture(self.interpreter, position, result, self.digest).save(self.path)
+
+    def resume(self):
+        """
+        Restores the interpreter from the snapshot file, if there is one.
+
+        Returns:
+            tuple: The position to continue from and the result of the last executed
+            statement, or (0, None) if there is no snapshot yet.
+
+        Raises:
+            ValueError: If the snapshot was taken for a different program or optimizer setting.
+        """
+        if not os.path.exists(self.path):
+            return 0, None
+        snapshot = Snapshot.load(self.path)
+        if snapshot.digest != self.digest:
+            raise ValueError(f"Снимок '{self.path}' создан для другой программы или настроек оптимизатора")
+        snapshot.restore(self.interpreter)
+        return snapshot.position, snapshot.result
+
+    def run(self, statements, start=0, result=None):
+        """
+        Runs the program from a given position, saving snapshots along the way.
+
+        Args:
+            statements (list of ASTNode): The top-level statements.
+            start (int, optional): Index of the first statement to run.
+            result (optional): The result to return if no statement is left to run.
+
+        Returns:
+            result: The result of the last executed statement.
+        """
+        for position in range(start, len(statements)):
+            result = self.interpreter.interpret_node(statements[position])
+            if self.every and (position + 1) % self.every == 0:
+                self.save(position + 1, result)
+        return str(result) if type(result) is Rope else result
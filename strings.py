@@ -0,0 +1,95 @@
+# Strings at least this long are turned into ropes when produced by '+'
+ROPE_THRESHOLD = 256
+
+
+class Rope:
+    """
+    Immutable string built by repeated concatenation and flattened lazily.
+
+    A rope appends pieces to a list shared with the rope it was built from, so
+    `s = s + piece` in a loop costs amortized O(len(piece)) instead of copying the
+    whole string each time. Several ropes may share one list: each one only uses
+    its first `count` pieces, and appending to a rope that is no longer the longest
+    user of its list copies the list first, so ropes behave like ordinary values.
+    Reading the characters (indexing, comparison, str()) joins the pieces once and
+    caches the result.
+
+    Attributes:
+        parts (list of str): The pieces, possibly shared with other ropes.
+        count (int): Number of pieces of `parts` belonging to this rope.
+        length (int): Total length of the string.
+        flat (str or None): The joined string, once computed.
+    """
+    __slots__ = ("parts", "count", "length", "flat")
+
+    def __init__(self, text, parts=None, count=1, length=None):
+        """
+        Initializes a rope from a string, or from shared pieces when extending a rope.
+
+        Args:
+            text (str or None): The initial string; ignored when `parts` is given.
+            parts (list of str, optional): Pieces shared with the rope being extended.
+            count (int, optional): Number of pieces belonging to the new rope.
+            length (int, optional): Total length of those pieces.
+        """
+        self.parts = [text] if parts is None else parts
+        self.count = count
+        self.length = len(text) if length is None else length
+        self.flat = text if parts is None else None
+
+    def __add__(self, other):
+        if isinstance(other, Rope):
+            other = str(other)
+        elif not isinstance(other, str):
+            return NotImplemented
+        parts = self.parts
+        if len(parts) != self.count:
+            # Another rope already extended the shared list past this one
+            parts = parts[:self.count]
+        parts.append(other)
+        return Rope(None, parts, self.count + 1, self.length + len(other))
+
+    def __radd__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Rope(other + str(self))
+
+    def __mul__(self, times):
+        return str(self) * times
+
+    __rmul__ = __mul__
+
+    def __str__(self):
+        if self.flat is None:
+            self.flat = "".join(self.parts[:self.count])
+        return self.flat
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return str(self)[index]
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __eq__(self, other):
+        return str(self) == str(other) if isinstance(other, (str, Rope)) else NotImplemented
+
+    def __ne__(self, other):
+        return str(self) != str(other) if isinstance(other, (str, Rope)) else NotImplemented
+
+    def __lt__(self, other):
+        return str(self) < str(other) if isinstance(other, (str, Rope)) else NotImplemented
+
+    def __le__(self, other):
+        return str(self) <= str(other) if isinstance(other, (str, Rope)) else NotImplemented
+
+    def __gt__(self, other):
+        return str(self) > str(other) if isinstance(other, (str, Rope)) else NotImplemented
+
+    def __ge__(self, other):
+        return str(self) >= str(other) if isinstance(other, (str, Rope)) else NotImplemented
@@ -1,17 +1,35 @@
 # test_cases.py
 
-from main import run
+import io
+import os
+import tempfile
 
-def run_test_case(code, expected_result):
+from main import run, run_stream
+
+def run_test_case(code, expected_result, runner=run, **options):
     print("=== Новый тест ===")
     print("Код:")
     print(code)
     print("\nОжидаемый результат:", expected_result)
-    result = run(code)  # Do not enable debug mode here
+    result = runner(code, **options)  # Do not enable debug mode here
     print("Результат:", result)
     print("Тест успешен!" if result == expected_result else "Тест провален!")
     print("\n" + "="*20 + "\n")
 
+def run_error_case(code, expected_error, **options):
+    print("=== Новый тест ===")
+    print("Код:")
+    print(code)
+    print("\nОжидаемая ошибка:", expected_error)
+    try:
+        result = run(code, **options)
+        print("Результат:", result)
+        print("Тест провален!")
+    except ValueError as error:
+        print("Ошибка:", error)
+        print("Тест успешен!" if str(error) == expected_error else "Тест провален!")
+    print("\n" + "="*20 + "\n")
+
 # Тесты
 
 # Тест 1: Возведение в степень с циклом while
@@ -137,3 +155,452 @@ while (i < 5) {
 sum;
 """, 15)
 
+
+# Тест 12: Деление с типами, выведенными статически и меняющимися в цикле
+run_test_case("""
+a = 7;
+b = 2;
+c = a / b;  # int / int -> 3
+d = 7.0 / b;  # float / int -> 3.5
+x = 1;
+i = 0;
+while (i < 2) {
+    x = x / 2.0;  # x is int on entry and float afterwards
+    i = i + 1;
+}
+result = c + d + x;
+result;
+""", 6.75)
+
+# Тест 13: Вынос инвариантов из вложенных циклов и повторное использование подвыражений
+run_test_case("""
+a = 3;
+b = 7;
+s = 0;
+i = 0;
+while (i < 20) {
+    j = 0;
+    while (j < 20) {
+        x = (a * b) + i;
+        y = (a * b) - j;
+        z = (x * 2) + (x * 2);
+        if (j > 5) {
+            s = s + (a / b) + (b / 2);
+        }
+        s = s + x + y + z;
+        j = j + 1;
+    }
+    i = i + 1;
+}
+s;
+""", 66440, optimize=True)
+
+# Тест 14: Вынесенное выражение не вычисляется, если цикл не выполняется ни разу
+run_test_case("""
+a = 5;
+b = 0;
+k = 0;
+while (k < 0) {
+    w = a / b;
+    k = k + 1;
+}
+k;
+""", 0, optimize=True)
+
+# Тест 15: Доступ к массиву по счётчику цикла без проверок границ
+run_test_case("""
+a = [1, 2, 3, 4, 5];
+b = [0, 0, 0, 0, 0];
+s = 0;
+i = 0;
+while (i < 5) {
+    b[i] = a[i] * 2;
+    s = s + b[i];
+    i = i + 1;
+}
+s;
+""", 30, optimize=True)
+
+# Тест 16: Выход за границы массива в оптимизированном цикле даёт ту же ошибку
+run_error_case("""
+a = [1, 2, 3];
+s = 0;
+i = 0;
+while (i < 4) {
+    s = s + a[i];
+    i = i + 1;
+}
+s;
+""", "Индекс 3 выходит за пределы массива 'a'", optimize=True)
+
+# Тест 17: Доступ после увеличения счётчика остаётся проверяемым
+run_error_case("""
+a = [1, 2, 3];
+s = 0;
+i = 0;
+while (i < 3) {
+    s = s + a[i];
+    i = i + 1;
+    s = s + a[i];
+}
+s;
+""", "Индекс 3 выходит за пределы массива 'a'", optimize=True)
+
+# Тест 18: Рекурсивная функция
+run_test_case("""
+function fib(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+r = fib(15);
+r;
+""", 610)
+
+# Тест 19: Мемоизация чистой функции
+run_test_case("""
+function fib(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+r = fib(60);
+r;
+""", 1548008755920, memoize=True)
+
+# Тест 20: Локальные переменные функции и изменение глобального массива
+run_test_case("""
+data = [1, 2, 3];
+total = 0;
+function add(x) {
+    total = x;  # local to the call
+    data[0] = data[0] + x;
+    return;
+}
+function five() {
+    return 5;
+}
+add(10);
+r = data[0] + total + five();
+r;
+""", 16, memoize=True)
+
+# Тест 21: Неверное число аргументов
+run_error_case("""
+function f(a) {
+    return a;
+}
+f(1, 2);
+""", "Функция 'f' ожидает 1 аргументов, получено 2")
+
+# Тест 22: Цикл for с шагом и итоговым значением счётчика
+run_test_case("""
+s = 0;
+for (i = 0; i < 10; i = i + 3) {
+    s = s + i;
+}
+r = s * 100 + i;  # s = 0 + 3 + 6 + 9, i = 12
+r;
+""", 1812)
+
+# Тест 23: Цикл for с обратным шагом и переменной границей
+run_test_case("""
+s = 0;
+n = 3;
+for (i = 10; n <= i; i = i - 2) s = s + i;
+r = s * 100 + i;  # s = 10 + 8 + 6 + 4, i = 2
+r;
+""", 2802)
+
+# Тест 24: Цикл for, тело которого меняет счётчик
+run_test_case("""
+s = 0;
+for (i = 0; i < 10; i = i + 1) {
+    i = i + 1;
+    s = s + i;
+}
+r = s * 100 + i;  # s = 1 + 3 + 5 + 7 + 9, i = 10
+r;
+""", 2510)
+
+# Тест 25: Цикл do-while выполняется хотя бы один раз
+run_test_case("""
+i = 10;
+do {
+    i = i + 1;
+} while (i < 5);
+i;
+""", 11)
+
+# Тест 26: Построчное выполнение программы из потока строк
+run_test_case("""
+function sq(x) {
+    return x * x;
+}
+s = 0;
+for (i = 1; i <= 5; i = i + 1) {
+    s = s + sq(i);
+}
+arr = [1, 2, 3];
+i = 0;
+while (i < 3) {
+    s = s + arr[i];
+    i = i + 1;
+}
+s;
+""", 61, runner=lambda code, **options: run_stream(io.StringIO(code), **options), optimize=True)
+
+# Тест 27: Обработчики событий выполнения с выборкой каждого N-го события
+writes = []
+iterations = []
+run_test_case("""
+arr = [0, 0, 0, 0];
+i = 0;
+while (i < 4) {
+    arr[i] = i * 10;
+    i = i + 1;
+}
+arr[3];
+""", 30, hooks=[
+    ("array_write", lambda name, index, value: writes.append((name, index, value))),
+    ("loop_iteration", lambda loop, iteration: iterations.append(iteration), 2),
+])
+print("События:", writes, iterations)
+print("Тест успешен!" if writes == [("arr", 0, 0), ("arr", 1, 10), ("arr", 2, 20), ("arr", 3, 30)]
+      and iterations == [2, 4] else "Тест провален!")
+
+# Тест 28: Строки: сцепление в цикле, индексация и сравнение
+run_test_case("""
+s = "";
+i = 0;
+while (i < 300) {
+    s = s + "ab";
+    i = i + 1;
+}
+t = s + "!";
+u = s + "?";
+if (t[600] == "!" && u[600] == "?" && s[1] == "b" && t != u && s < t) {
+    r = "ok";
+} else {
+    r = "fail";
+}
+r = r + "-" + s[0];
+r;
+""", "ok-a", optimize=True)
+
+# Тест 29: Индекс за пределами строки
+run_error_case("""
+s = "abc";
+c = s[3];
+""", "Индекс 3 выходит за пределы строки 's'")
+
+# Тест 30: Независимые циклы выполняются в отдельных процессах с тем же результатом
+run_test_case("""
+a = 0;
+i = 0;
+while (i < 2000) {
+    a = a + i * 2;
+    i = i + 1;
+}
+b = 1.0;
+for (j = 0; j < 50; j = j + 1) {
+    b = b * 1.5;
+}
+s = "";
+k = 0;
+while (k < 100) {
+    s = s + "ab";
+    k = k + 1;
+}
+r = a + b / 1000000 + k + i + j;
+r;
+""", 3998000 + 1.5 ** 50 / 1000000 + 100 + 2000 + 50, parallel=2, optimize=True)
+
+# Тест 31: При параллельном выполнении сообщается первая по порядку ошибка
+run_error_case("""
+arr = [1, 2];
+function noop() {
+    return 0;
+}
+c = 0;
+i = 0;
+while (i < 5) {
+    if (arr[i] > 0) {
+        c = c + 1;
+    }
+    i = i + 1;
+}
+j = 0;
+while (j < 5) {
+    j = j + 1;
+}
+z = arr[7];
+""", "Индекс 2 выходит за пределы массива 'arr'", parallel=2)
+
+# Тест 32: Возобновление выполнения со снимка состояния
+snapshot_path = os.path.join(tempfile.mkdtemp(), "snapshot.bin")
+snapshot_code = """
+function sq(x) {
+    return x * x;
+}
+arr = [0] * 5;
+i = 0;
+while (i < 5) {
+    arr[i] = sq(i);
+    i = i + 1;
+}
+s = "ab" + "cd";
+r = arr[4] + sq(3);
+r;
+"""
+run_test_case(snapshot_code, 25, snapshot=snapshot_path, snapshot_every=3)
+resumed_writes = []
+run_test_case(snapshot_code, 25, snapshot=snapshot_path, resume=True,
+              hooks=[("variable_write", lambda name, value: resumed_writes.append(name))])
+print("Записи после возобновления:", resumed_writes)
+print("Тест успешен!" if resumed_writes == [] else "Тест провален!")
+
+# Тест 33: Снимок другой программы не принимается
+run_error_case(snapshot_code + "r = 0;", f"Снимок '{snapshot_path}' создан для другой программы или настроек оптимизатора",
+               snapshot=snapshot_path, resume=True)
+
+# Тест 34: Правый операнд && не вычисляется, если левый ложен
+run_test_case("""
+a = [3, 1, 4];
+n = 3;
+i = 0;
+while (i < n && a[i] != 0) {
+    i = i + 1;
+}
+if (i >= n || a[i] == 0) {
+    r = i;
+} else {
+    r = 0 - 1;
+}
+r;
+""", 3)
+
+# Тест 35: && и || возвращают решающий операнд, общие подвыражения из правого операнда не переиспользуются
+run_test_case("""
+k = 0;
+c = k > 0 && k * 3 > 5;
+e = k * 3 + 1;
+x = 0 || 5;
+y = 3 && 0;
+r = x * 100 + y * 10 + e;
+r;
+""", 501, optimize=True)
+
+# Тест 36: Присваивание в пропущенном правом операнде && не меняет выведенный тип
+run_test_case("""
+x = 1;
+k = 0;
+c = k > 0 && (x = 2.5);
+y = x / 2;
+y;
+""", 0)
+
+# Тест 37: Невыполненное присваивание в параллельной группе не разрывает общий массив
+run_test_case("""
+x = [1, 2];
+y = x;
+function noop() {
+    return 0;
+}
+i = 0;
+while (i < 0) {
+    x = 5;
+    i = i + 1;
+}
+j = 0;
+while (j < 3) {
+    j = j + 1;
+}
+y[0] = 9;
+r = x[0] + j;
+r;
+""", 12, parallel=2)
+
+# Тест 38: Глубокая рекурсия в пределах допустимой глубины вызовов
+recursive_sum = """
+function s(n) {
+    if (n < 1) {
+        return 0;
+    }
+    return n + s(n - 1);
+}
+r = s(N);
+r;
+"""
+run_test_case(recursive_sum.replace("N", "500"), 125250)
+
+# Тест 39: Превышение максимальной глубины вызовов
+run_error_case(recursive_sum.replace("N", "5000"), "Превышена максимальная глубина вызовов (1000) в функции 's'")
+
+# Тест 40: Снимок без оптимизатора не возобновляется с оптимизатором, снимки несовместимы с parallel
+cse_snapshot_path = os.path.join(tempfile.mkdtemp(), "snapshot.bin")
+cse_code = """
+a = 3;
+b = 4;
+x = a * b;
+z = 1;
+y = a * b;
+r = x + y;
+r;
+"""
+run_test_case(cse_code, 24, snapshot=cse_snapshot_path, snapshot_every=4)
+run_error_case(cse_code, f"Снимок '{cse_snapshot_path}' создан для другой программы или настроек оптимизатора",
+               snapshot=cse_snapshot_path, resume=True, optimize=True)
+run_test_case(cse_code, 24, snapshot=cse_snapshot_path, resume=True)
+run_error_case(cse_code, "Снимки состояния нельзя сочетать с параллельным выполнением",
+               snapshot=cse_snapshot_path, parallel=2)
+
+# Тест 41: Временные переменные оптимизатора при потоковом выполнении используются повторно
+run_test_case("""
+a = 3;
+b = 4;
+x = a * b + a * b;
+i = 0;
+s = 0;
+while (i < 5) {
+    s = s + a * b + i;
+    i = i + 1;
+}
+y = (x + s) * (x + s);
+r = y + a * b;
+r;
+""", 8848, runner=lambda code, **options: run_stream(io.StringIO(code), **options), optimize=True)
+
+# Тест 42: Операторы из одного литерала или переменной тоже сообщаются обработчикам
+statement_lines = []
+run_test_case("x = 1;\ny = 2;\nx;\n5;", 5, hooks=[("statement", lambda node: statement_lines.append(node.line))])
+print("Строки:", statement_lines)
+print("Тест успешен!" if statement_lines == [1, 2, 3, 4] else "Тест провален!")
+
+# Тест 43: Запись в массив без проверок границ в оптимизированном цикле сообщается обработчикам
+unchecked_writes = []
+run_test_case("""
+arr = [0, 0, 0];
+i = 0;
+while (i < 3) {
+    arr[i] = i + 5;
+    i = i + 1;
+}
+arr[2];
+""", 7, optimize=True, hooks=[("array_write", lambda name, index, value: unchecked_writes.append((index, value)))])
+print("События:", unchecked_writes)
+print("Тест успешен!" if unchecked_writes == [(0, 5), (1, 6), (2, 7)] else "Тест провален!")
+
+# Тест 44: Счётчик цикла for сообщается обработчикам записи переменных
+counter_writes = []
+run_test_case("""
+s = 0;
+for (i = 0; i < 3; i = i + 1) {
+    s = s + i;
+}
+s;
+""", 3, hooks=[("variable_write", lambda name, value: counter_writes.append(value) if name == "i" else None)])
+print("События:", counter_writes)
+print("Тест успешен!" if counter_writes == [0, 1, 2, 3] else "Тест провален!")
@@ -0,0 +1,333 @@
+from ast import *
+
+# Static types assigned to expressions by the inference pass
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+ARRAY = "array"
+STRING = "string"
+UNKNOWN = "unknown"
+
+NUMERIC_TYPES = {INT, FLOAT, BOOL}
+COMPARISON_OPS = {'<', '>', '<=', '>=', '==', '!='}
+LOGICAL_OPS = {'&&', '||'}
+
+
+def join_types(first, second):
+    """
+    Joins two types at a control-flow merge point.
+
+    Args:
+        first (str): Type reaching the merge point along one path.
+        second (str): Type reaching the merge point along another path.
+
+    Returns:
+        str: The common type, or UNKNOWN if the paths disagree.
+    """
+    return first if first == second else UNKNOWN
+
+
+def binop_type(op, left, right):
+    """
+    Computes the result type of a binary operation from the operand types.
+
+    The rules mirror what the interpreter does at runtime: '/' on two integers
+    is integer division, booleans behave as integers in arithmetic, and '&&'/'||'
+    return one of their operands.
+
+    Args:
+        op (str): The operator of the BinOpNode.
+        left (str): Type of the left operand.
+        right (str): Type of the right operand.
+
+    Returns:
+        str: The type of the operation result.
+    """
+    if op in COMPARISON_OPS:
+        return BOOL
+    if op in LOGICAL_OPS:
+        return join_types(left, right)
+    if left in NUMERIC_TYPES and right in NUMERIC_TYPES:
+        return FLOAT if FLOAT in (left, right) else INT
+    if op == '+' and left == ARRAY and right == ARRAY:
+        return ARRAY
+    if op == '+' and left == STRING and right == STRING:
+        return STRING
+    if op == '*' and STRING in (left, right) and {left, right} <= {STRING, INT, BOOL}:
+        return STRING
+    if op == '*' and ARRAY in (left, right) and {left, right} <= {ARRAY, INT, BOOL}:
+        return ARRAY
+    return UNKNOWN
+
+
+class TypeInferencer:
+    """
+    Flow-sensitive type inference over a parsed program.
+
+    Every expression node visited gets its `inferred_type` attribute set to one of
+    INT, FLOAT, BOOL, ARRAY, STRING or UNKNOWN. Variable types are propagated through
+    assignments and joined where control flow merges (after 'if' branches and at
+    the head of loops, which are iterated to a fixed point).
+
+    Attributes:
+        env (dict): Maps variable names to their types at the current program point.
+        unset_type (str): Type of a variable that has not been assigned yet.
+        record (bool): Whether statements are recorded for the debug dump.
+        records (dict): Statement id mapped to (line, node, type, env) for the debug dump.
+    """
+
+    def __init__(self, env=None, record=False):
+        """
+        Initializes the inferencer.
+
+        Args:
+            env (dict, optional): Known variable types at the start of the program.
+            record (bool, optional): Record the types after every statement for `dump`.
+                This keeps a copy of the environment per statement, so it is off by default.
+        """
+        self.env = dict(env) if env else {}
+        # Reading an undefined variable yields 0 in the interpreter
+        self.unset_type = INT
+        self.record = record
+        self.records = {}
+
+    def infer(self, statements):
+        """
+        Infers and annotates types for a list of top-level statements.
+
+        Args:
+            statements (list of ASTNode): The program to analyze.
+
+        Returns:
+            dict: Variable types after the last statement.
+        """
+        self.env = self.infer_block(statements, self.env)
+        return self.env
+
+    def infer_block(self, statements, env):
+        """
+        Infers types for a list of statements executed in sequence.
+
+        Args:
+            statements (list of ASTNode): The statements to analyze.
+            env (dict): Variable types before the first statement; updated in place.
+
+        Returns:
+            dict: Variable types after the last statement.
+        """
+        for statement in statements:
+            env = self.infer_statement(statement, env)
+        return env
+
+    def infer_statement(self, node, env):
+        """
+        Infers types for a single statement and records it for the debug dump.
+
+        Args:
+            node (ASTNode): The statement to analyze.
+            env (dict): Variable types before the statement; updated in place.
+
+        Returns:
+            dict: Variable types after the statement.
+        """
+        if isinstance(node, WhileNode):
+            env = self.infer_while(node, env)
+            node_type = None
+        elif isinstance(node, IfNode):
+            env = self.infer_if(node, env)
+            node_type = None
+        elif isinstance(node, ForNode):
+            env = self.infer_for(node, env)
+            node_type = None
+        elif isinstance(node, DoWhileNode):
+            env = self.infer_do_while(node, env)
+            node_type = None
+        elif isinstance(node, FunctionDefNode):
+            self.infer_function(node)
+            node_type = None
+        else:
+            node_type = self.infer_expr(node, env)
+        if self.record and isinstance(node, ASTNode):
+            self.records[id(node)] = (node.line, node, node_type, dict(env))
+        return env
+
+    def infer_while(self, node, env):
+        """
+        Infers types for a 'while' loop by iterating its body to a fixed point.
+
+        Args:
+            node (WhileNode): The loop to analyze.
+            env (dict): Variable types on loop entry.
+
+        Returns:
+            dict: Variable types on loop exit.
+        """
+        head = dict(env)
+        while True:
+            after_condition = dict(head)
+            self.infer_expr(node.condition, after_condition)
+            after_body = self.infer_block(node.body, dict(after_condition))
+            new_head = self.join_envs(head, after_body)
+            if new_head == head:
+                return after_condition
+            head = new_head
+
+    def infer_for(self, node, env):
+        """
+        Infers types for a 'for' loop by iterating its body and step to a fixed point.
+
+        Args:
+            node (ForNode): The loop to analyze.
+            env (dict): Variable types before the loop.
+
+        Returns:
+            dict: Variable types on loop exit.
+        """
+        if node.init is not None:
+            self.infer_expr(node.init, env)
+        head = dict(env)
+        while True:
+            after_condition = dict(head)
+            self.infer_expr(node.condition, after_condition)
+            after_body = self.infer_block(node.body, dict(after_condition))
+            if node.step is not None:
+                self.infer_expr(node.step, after_body)
+            new_head = self.join_envs(head, after_body)
+            if new_head == head:
+                return after_condition
+            head = new_head
+
+    def infer_do_while(self, node, env):
+        """
+        Infers types for a 'do-while' loop, whose body runs before the first condition check.
+
+        Args:
+            node (DoWhileNode): The loop to analyze.
+            env (dict): Variable types on loop entry.
+
+        Returns:
+            dict: Variable types on loop exit.
+        """
+        head = dict(env)
+        while True:
+            after_condition = self.infer_block(node.body, dict(head))
+            self.infer_expr(node.condition, after_condition)
+            new_head = self.join_envs(head, after_condition)
+            if new_head == head:
+                return after_condition
+            head = new_head
+
+    def infer_if(self, node, env):
+        """
+        Infers types for an 'if' statement and joins the branch results.
+
+        Args:
+            node (IfNode): The conditional to analyze.
+            env (dict): Variable types before the statement; updated by the condition.
+
+        Returns:
+            dict: Variable types after the statement.
+        """
+        self.infer_expr(node.condition, env)
+        then_env = self.infer_block(node.if_body, dict(env))
+        else_env = self.infer_block(node.else_body or [], dict(env))
+        return self.join_envs(then_env, else_env)
+
+    def infer_function(self, node):
+        """
+        Infers types inside a function body, which runs in its own frame.
+
+        Parameter types are not known, and reads of names the body has not assigned
+        may reach global variables, so both start as UNKNOWN.
+
+        Args:
+            node (FunctionDefNode): The function to analyze.
+        """
+        outer_unset_type = self.unset_type
+        self.unset_type = UNKNOWN
+        try:
+            self.infer_block(node.body, {param: UNKNOWN for param in node.params})
+        finally:
+            self.unset_type = outer_unset_type
+
+    def join_envs(self, first, second):
+        """
+        Joins two variable environments at a control-flow merge point.
+
+        Args:
+            first (dict): Variable types along one path.
+            second (dict): Variable types along another path.
+
+        Returns:
+            dict: The joined environment.
+        """
+        return {name: join_types(first.get(name, self.unset_type), second.get(name, self.unset_type))
+                for name in first.keys() | second.keys()}
+
+    def infer_expr(self, node, env):
+        """
+        Infers and annotates the type of an expression.
+
+        Args:
+            node (ASTNode): The expression to analyze.
+            env (dict): Variable types at this point; assignments update it in place.
+
+        Returns:
+            str: The inferred type of the expression.
+        """
+        if isinstance(node, NumberNode):
+            node_type = FLOAT if isinstance(node.value, float) else INT
+        elif isinstance(node, StringNode):
+            node_type = STRING
+        elif isinstance(node, VarAccessNode):
+            node_type = env.get(node.name, self.unset_type)
+        elif isinstance(node, VarAssignNode):
+            node_type = self.infer_expr(node.value, env)
+            env[node.name] = node_type
+        elif isinstance(node, BinOpNode):
+            left = self.infer_expr(node.left, env)
+            if node.op in LOGICAL_OPS:
+                # The right operand may be skipped, so its assignments happen only on one path
+                right_env = dict(env)
+                right = self.infer_expr(node.right, right_env)
+                env.update(self.join_envs(env, right_env))
+            else:
+                right = self.infer_expr(node.right, env)
+            node_type = binop_type(node.op, left, right)
+        elif isinstance(node, ArrayLiteralNode):
+            for element in node.elements:
+                self.infer_expr(element, env)
+            node_type = ARRAY
+        elif isinstance(node, IndexAccessNode):
+            self.infer_expr(node.index, env)
+            # Arrays are mutable and may be aliased, so element types are not tracked
+            node_type = STRING if env.get(node.array_name) == STRING else UNKNOWN
+        elif isinstance(node, IndexAssignNode):
+            self.infer_expr(node.index, env)
+            node_type = self.infer_expr(node.value, env)
+        elif isinstance(node, CallNode):
+            for arg in node.args:
+                self.infer_expr(arg, env)
+            node_type = UNKNOWN
+        elif isinstance(node, ReturnNode):
+            if node.value is not None:
+                self.infer_expr(node.value, env)
+            return UNKNOWN
+        else:
+            return UNKNOWN
+        node.inferred_type = node_type
+        return node_type
+
+    def dump(self):
+        """
+        Formats the inferred types per source line for debugging.
+
+        Returns:
+            list of str: One line per analyzed statement, in source order.
+        """
+        lines = []
+        for line, node, node_type, env in sorted(self.records.values(), key=lambda record: record[0] or 0):
+            variables = ", ".join(f"{name}: {env[name]}" for name in sorted(env))
+            result = f" -> {node_type}" if node_type else ""
+            lines.append(f"строка {line}: {type(node).__name__}{result} | {variables}")
+        return lines